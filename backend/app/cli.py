@@ -0,0 +1,72 @@
+"""Command-line maintenance jobs.
+
+Usage:
+    python -m app.cli reconcile-stars
+    python -m app.cli refresh-leaderboards [--every SECONDS]
+    python -m app.cli backfill-stats
+"""
+import argparse
+import time
+from app.database import SessionLocal
+from app import models  # noqa: F401 - register all mappers
+from app.controllers import star_controller, stats_controller, trending_controller
+
+
+def reconcile_stars(args: argparse.Namespace) -> None:
+    """Rebuild denormalized repository star counts."""
+    db = SessionLocal()
+    try:
+        corrected = star_controller.reconcile_stars_counts(db, args.chunk_size)
+        print(f"Corrected stars_count on {corrected} repositories")
+    finally:
+        db.close()
+
+
+def refresh_leaderboards(args: argparse.Namespace) -> None:
+    """Rebuild the trending repository leaderboards, once or every --every seconds."""
+    while True:
+        db = SessionLocal()
+        try:
+            written = trending_controller.refresh_leaderboards(db, args.size)
+            print(", ".join(f"{window}: {count} entries" for window, count in written.items()), flush=True)
+        finally:
+            db.close()
+        if not args.every:
+            return
+        time.sleep(args.every)
+
+
+def backfill_stats(args: argparse.Namespace) -> None:
+    """Rebuild repository statistics rollups from commit, issue and star history."""
+    db = SessionLocal()
+    try:
+        rebuilt = stats_controller.rebuild_repository_stats(db, args.repository or None, args.chunk_size)
+        print(f"Rebuilt statistics of {rebuilt} repositories")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser("reconcile-stars", help=reconcile_stars.__doc__)
+    reconcile.add_argument("--chunk-size", type=int, default=10000)
+    reconcile.set_defaults(func=reconcile_stars)
+
+    leaderboards = commands.add_parser("refresh-leaderboards", help=refresh_leaderboards.__doc__)
+    leaderboards.add_argument("--size", type=int, default=None)
+    leaderboards.add_argument("--every", type=int, default=0, help="Keep running, refreshing every SECONDS")
+    leaderboards.set_defaults(func=refresh_leaderboards)
+
+    backfill = commands.add_parser("backfill-stats", help=backfill_stats.__doc__)
+    backfill.add_argument("--repository", type=int, action="append", help="Only this repository (repeatable)")
+    backfill.add_argument("--chunk-size", type=int, default=stats_controller.REBUILD_CHUNK_SIZE)
+    backfill.set_defaults(func=backfill_stats)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
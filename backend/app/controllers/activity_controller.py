@@ -0,0 +1,173 @@
+"""Activity controller - event log, timelines and feeds.
+
+Commit, issue and star creation append a compact event in the writer's
+transaction and fan it out to the timelines of the actor, the repository
+owner and the repository's stargazers. Reading a feed is then one range
+scan of the reader's timeline.
+
+Repositories with more than FEED_FANOUT_MAX_STARS stars are the very
+active sources here: copying each of their events to every stargazer would
+make writes cost O(stars). star_controller flags them (feed_fanout_on_read)
+when they cross the threshold; their events are then not fanned out to
+stargazers, and feeds merge them in on read from the repository's own event
+range instead. The flag is never cleared, so no event is ever in neither
+place.
+"""
+from typing import Optional
+from sqlalchemy import Enum, insert, literal, select, union
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from app.models.activity import ActivityEvent, ActivityKind, TimelineEntry
+from app.models.repository import Repository
+from app.models.star import Star
+from app.schemas.activity_schema import ActivityEventResponse
+from app.utils.bulk_delete import DELETE_CHUNK_SIZE
+from app.utils.pagination import Page, decode_id_cursor, encode_id_cursor
+from app.utils.serialization import Projection
+
+ACTIVITY_LIST = Projection(ActivityEventResponse, ActivityEvent)
+
+
+def record_event(db: Session, actor_id: int, repository_id: int, kind: ActivityKind, subject_id: int) -> None:
+    """Append one event and fan it out, inside the caller's transaction."""
+    result = db.execute(insert(ActivityEvent).values(
+        actor_id=actor_id, repository_id=repository_id, kind=kind, subject_id=subject_id
+    ))
+    _fan_out(db, [result.inserted_primary_key[0]])
+
+
+def record_events(db: Session, kind: ActivityKind, source) -> None:
+    """Append and fan out one event per row of `source`, inside the caller's transaction.
+
+    `source` selects (actor_id, repository_id, subject_id) for subjects that
+    have no event yet, e.g. the commits of a batch just inserted. The events
+    are written with one INSERT ... SELECT, ordered by subject id so their
+    ids (and so feed order) follow the order the subjects were written, and
+    fanned out with another, after reading back their ids.
+    """
+    source = source.subquery()
+    kind_value = literal(kind, Enum(ActivityKind))
+    db.execute(insert(ActivityEvent).from_select(
+        ["actor_id", "repository_id", "kind", "subject_id"],
+        select(source.c[0], source.c[1], kind_value, source.c[2]).order_by(source.c[2])
+    ))
+    event_ids = db.scalars(select(ActivityEvent.id).where(
+        ActivityEvent.kind == kind,
+        ActivityEvent.subject_id.in_(select(source.c[2]))
+    )).all()
+    if event_ids:
+        _fan_out(db, event_ids)
+
+
+def _fan_out(db: Session, event_ids: list[int]) -> None:
+    # One INSERT ... SELECT delivering the events to every recipient; UNION
+    # drops duplicates such as an owner starring their own repository
+    events = select(ActivityEvent.id, ActivityEvent.actor_id, ActivityEvent.repository_id).where(
+        ActivityEvent.id.in_(event_ids)
+    ).subquery()
+    recipients = union(
+        select(events.c.actor_id, events.c.id),
+        select(Repository.owner_id, events.c.id).join(Repository, Repository.id == events.c.repository_id),
+        select(Star.user_id, events.c.id).join(
+            Repository, Repository.id == events.c.repository_id
+        ).join(
+            Star, Star.repository_id == events.c.repository_id
+        ).where(Repository.feed_fanout_on_read.is_(False)),
+    )
+    db.execute(insert(TimelineEntry).from_select(["user_id", "event_id"], recipients))
+
+
+def get_feed(db: Session, user_id: int, limit: int = 30, cursor: Optional[str] = None) -> Page:
+    """Get a page of a user's feed, newest first.
+
+    The feed holds the user's own activity and activity on repositories
+    they own or have starred. It is one range scan of the user's timeline,
+    plus one range scan over the events of any starred repositories too
+    popular to be fanned out.
+    """
+    before = decode_id_cursor(cursor) if cursor else None
+    timeline = ACTIVITY_LIST.query(db).join(
+        TimelineEntry, TimelineEntry.event_id == ActivityEvent.id
+    ).filter(TimelineEntry.user_id == user_id)
+    items = _newest(timeline, TimelineEntry.event_id, before, limit)
+    hot = _hot_starred(db, user_id)
+    if hot:
+        merged = _newest(ACTIVITY_LIST.query(db).filter(ActivityEvent.repository_id.in_(hot)), ActivityEvent.id, before, limit)
+        # An event fanned out before its repository became popular is in both
+        items = sorted({item["id"]: item for item in items + merged}.values(), key=lambda item: item["id"], reverse=True)
+    return _page(items, limit)
+
+
+def get_user_activity(db: Session, user_id: int, limit: int = 30, cursor: Optional[str] = None) -> Page:
+    """Get a page of a user's own activity, newest first (profile page)."""
+    before = decode_id_cursor(cursor) if cursor else None
+    query = ACTIVITY_LIST.query(db).filter(ActivityEvent.actor_id == user_id)
+    return _page(_newest(query, ActivityEvent.id, before, limit), limit)
+
+
+def get_repository_activity(db: Session, repo_id: int, limit: int = 30, cursor: Optional[str] = None) -> Page:
+    """Get a page of a repository's activity, newest first."""
+    repo = db.query(Repository.id).filter(Repository.id == repo_id).first()
+    if not repo:
+        raise HTTPException(status_code=404, detail="Repository not found")
+    before = decode_id_cursor(cursor) if cursor else None
+    query = ACTIVITY_LIST.query(db).filter(ActivityEvent.repository_id == repo_id)
+    return _page(_newest(query, ActivityEvent.id, before, limit), limit)
+
+
+def _newest(query, id_col, before: Optional[int], limit: int) -> list[dict]:
+    # One extra row tells whether another page exists
+    if before is not None:
+        query = query.filter(id_col < before)
+    return ACTIVITY_LIST.to_dicts(query.order_by(id_col.desc()).limit(limit + 1))
+
+
+def _page(items: list[dict], limit: int) -> Page:
+    if len(items) > limit:
+        items = items[:limit]
+        return Page(items, encode_id_cursor(items[-1]["id"]))
+    return Page(items)
+
+
+def _hot_starred(db: Session, user_id: int) -> list[int]:
+    """The fan-out-on-read repositories `user_id` has starred."""
+    hot = hot_repository_ids(db)
+    if not hot:
+        return []
+    return [row.repository_id for row in db.query(Star.repository_id).filter(
+        Star.user_id == user_id, Star.repository_id.in_(hot)
+    )]
+
+
+def hot_repository_ids(db: Session) -> list[int]:
+    """Ids of repositories whose events are merged into feeds on read.
+
+    A range of ix_repositories_feed_fanout_on_read; the flagged set is small
+    by construction (only repositories above FEED_FANOUT_MAX_STARS).
+    """
+    return [row.id for row in db.query(Repository.id).filter(Repository.feed_fanout_on_read.is_(True))]
+
+
+def purge_events(db: Session, *criteria, chunk_size: int = DELETE_CHUNK_SIZE) -> None:
+    """Delete the events matching `criteria` and their timeline entries, in committed chunks."""
+    while True:
+        ids = [row_id for row_id, in db.query(ActivityEvent.id).filter(*criteria).limit(chunk_size)]
+        if not ids:
+            return
+        db.query(TimelineEntry).filter(TimelineEntry.event_id.in_(ids)).delete(synchronize_session=False)
+        db.query(ActivityEvent).filter(ActivityEvent.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+def purge_timeline(db: Session, user_id: int, chunk_size: int = DELETE_CHUNK_SIZE) -> None:
+    """Delete a user's timeline in committed chunks."""
+    while True:
+        ids = [event_id for event_id, in db.query(TimelineEntry.event_id).filter(
+            TimelineEntry.user_id == user_id
+        ).limit(chunk_size)]
+        if not ids:
+            return
+        db.query(TimelineEntry).filter(
+            TimelineEntry.user_id == user_id, TimelineEntry.event_id.in_(ids)
+        ).delete(synchronize_session=False)
+        db.commit()
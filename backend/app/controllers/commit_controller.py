@@ -1,56 +1,283 @@
 """Commit controller - business logic for commits."""
-from sqlalchemy.orm import Session
+import time
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Union
+from pydantic import ValidationError
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
+from app.models.activity import ActivityKind
 from app.models.commit import Commit
 from app.models.repository import Repository
 from app.models.user import User
-from app.schemas.commit_schema import CommitCreate
-from app.utils.helpers import generate_commit_hash
+from app.schemas.commit_schema import CommitCreate, CommitResponse, CommitBatchItem, CommitBatchResult, CommitBatchResponse
+from app.utils.helpers import commit_hash, commit_nonce, commit_timestamp
+from app.utils.integrity import raise_for_integrity_error
+from app.utils.pagination import Page, created_between, paginate
+from app.utils.serialization import Projection
+from app.utils.bulk_delete import DELETE_CHUNK_SIZE
+from app.utils import ndjson, rollups
+from app.controllers import activity_controller
+
+COMMIT_LIST = Projection(CommitResponse, Commit)
+COMMIT_EXPORT = COMMIT_LIST.narrow(expand="")
+
+# Commits written per INSERT/transaction by create_commits_batch
+BATCH_CHUNK_SIZE = 1000
 
 
 def get_commit(db: Session, commit_id: int) -> Commit:
     """Get a commit by ID."""
-    commit = db.query(Commit).filter(Commit.id == commit_id).first()
+    commit = db.query(Commit).options(joinedload(Commit.author)).filter(Commit.id == commit_id).first()
     if not commit:
         raise HTTPException(status_code=404, detail="Commit not found")
     return commit
 
 
-def get_commits_by_repository(db: Session, repo_id: int, skip: int = 0, limit: int = 100) -> list[Commit]:
-    """Get all commits for a repository."""
+def get_commits_by_repository(
+    db: Session, repo_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    fields: Optional[str] = None, expand: Optional[str] = None
+) -> Page:
+    """Get a page of commits for a repository, newest first."""
     # Verify repository exists
     repo = db.query(Repository).filter(Repository.id == repo_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
     
-    return db.query(Commit).filter(Commit.repository_id == repo_id).order_by(Commit.created_at.desc()).offset(skip).limit(limit).all()
+    projection = COMMIT_LIST.narrow(fields, expand)
+    query = projection.query(db).filter(Commit.repository_id == repo_id)
+    page = paginate(query, Commit.created_at, Commit.id, cursor, skip, limit)
+    return page._replace(items=projection.to_dicts(page.items))
 
 
-def create_commit(db: Session, commit: CommitCreate) -> Commit:
-    """Create a new commit."""
-    # Verify repository exists
-    repo = db.query(Repository).filter(Repository.id == commit.repository_id).first()
-    if not repo:
+def iter_commits(
+    db: Session, repo_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> Iterator[dict]:
+    """Stream a repository's commits, oldest first, through a server-side cursor."""
+    query = created_between(COMMIT_EXPORT.query(db).filter(Commit.repository_id == repo_id), Commit.created_at, since, until)
+    return COMMIT_EXPORT.stream(query.order_by(Commit.created_at, Commit.id))
+
+
+def get_commits_version(db: Session, repo_id: int) -> tuple:
+    """Version stamp of a repository's commit list: (version, last change).
+
+    Both are read from the repository row, which every commit write bumps,
+    so the stamp costs one primary key lookup however long the history is.
+    Raises 404 if the repository does not exist.
+    """
+    version = db.query(Repository.commits_version, Repository.commits_updated_at).filter(
+        Repository.id == repo_id
+    ).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Repository not found")
-    
-    # Verify author exists
-    author = db.query(User).filter(User.id == commit.author_id).first()
-    if not author:
-        raise HTTPException(status_code=404, detail="Author not found")
-    
-    # Generate unique commit hash
-    commit_hash = generate_commit_hash()
-    # Ensure hash is unique (very unlikely collision, but check anyway)
-    while db.query(Commit).filter(Commit.hash == commit_hash).first():
-        commit_hash = generate_commit_hash()
-    
+    return tuple(version)
+
+
+def bump_commits_version(db: Session, repository_ids: Union[list[int], Select]) -> None:
+    """Bump the commit list version of the given repositories (ids, or a SELECT of ids).
+
+    Runs as a single UPDATE inside the caller's transaction, so the version
+    commits or rolls back together with the commit rows.
+    """
+    db.query(Repository).filter(Repository.id.in_(repository_ids)).update(
+        {
+            Repository.commits_version: Repository.commits_version + 1,
+            Repository.commits_updated_at: func.now(),
+            # Commit activity is not an edit of the repository itself
+            Repository.updated_at: Repository.updated_at,
+        },
+        synchronize_session=False
+    )
+
+
+def remove_user_commits(db: Session, user_id: int, chunk_size: int = DELETE_CHUNK_SIZE) -> list[int]:
+    """Delete all of a user's commits in chunks, bumping the commit list version of their repositories.
+
+    Each chunk commits its deletes and version bump together. Returns the
+    ids of the repositories that lost commits.
+    """
+    repository_ids = []
+    while True:
+        rows = db.query(Commit.id, Commit.repository_id).filter(Commit.author_id == user_id).limit(chunk_size).all()
+        if not rows:
+            return repository_ids
+        db.query(Commit).filter(Commit.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        chunk_repository_ids = list({row.repository_id for row in rows})
+        bump_commits_version(db, chunk_repository_ids)
+        db.commit()
+        repository_ids.extend(chunk_repository_ids)
+
+
+def create_commit(db: Session, commit: CommitCreate) -> Commit:
+    """Create a new commit on top of the repository's newest commit.
+
+    The only read is the parent hash; foreign keys validate the repository
+    and author, which are looked up only when the insert is rejected. The
+    hash includes a random nonce, so a new commit never collides with an
+    existing one, however alike their content. Called with a get_create_db
+    session, the returned row is not reloaded after commit.
+    """
+    head = db.scalar(_head_hash(commit.repository_id))
+    created_at = commit_timestamp()
     db_commit = Commit(
         repository_id=commit.repository_id,
         author_id=commit.author_id,
         message=commit.message,
-        hash=commit_hash
+        hash=commit_hash(commit.repository_id, head, commit.author_id, created_at, commit.message, commit_nonce()),
+        created_at=created_at
     )
     db.add(db_commit)
-    db.commit()
-    db.refresh(db_commit)
+    bump_commits_version(db, [commit.repository_id])
+    try:
+        db.flush()
+        rollups.record_commits(db, [(commit.repository_id, commit.author_id, created_at)])
+        activity_controller.record_event(db, commit.author_id, commit.repository_id, ActivityKind.COMMIT, db_commit.id)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise_for_integrity_error(
+            db,
+            [(Repository, commit.repository_id, "Repository not found"), (User, commit.author_id, "Author not found")],
+            "Failed to create commit"
+        )
     return db_commit
+
+
+def _head_hash(repo_id: int, before: Optional[datetime] = None):
+    """Query for the hash of a repository's newest commit, or its newest one created before `before`."""
+    statement = select(Commit.hash).where(Commit.repository_id == repo_id)
+    if before is not None:
+        statement = statement.where(Commit.created_at < before)
+    return statement.order_by(Commit.created_at.desc(), Commit.id.desc()).limit(1)
+
+
+def create_commits_batch(db: Session, repo_id: int, items: Iterable[Any]) -> CommitBatchResponse:
+    """Create many commits in one repository from raw decoded JSON items.
+
+    `items` is consumed lazily, so a streamed body is validated and written
+    as it arrives.
+
+    The repository is checked once and authors once per distinct id. Valid
+    items are written with multi-row INSERTs, one transaction per chunk of
+    BATCH_CHUNK_SIZE items, so a failing chunk does not undo earlier ones.
+    Invalid items are reported individually and skipped.
+
+    The first valid item's parent is the repository's head, and each later
+    item's parent is the previous valid item. Items without `created_at`
+    are new commits: they are stamped now and hash a random nonce, so they
+    never collide. Items with `created_at` are imports: their parent chain
+    starts at the newest commit created before the first of them, and they
+    hash no nonce unless they carry one. Re-sending an import therefore
+    reports the existing commits as duplicates instead of inserting them
+    twice.
+    """
+    started = time.perf_counter()
+    repo = db.query(Repository.id).filter(Repository.id == repo_id).first()
+    if not repo:
+        raise HTTPException(status_code=404, detail="Repository not found")
+
+    results: list[CommitBatchResult] = []
+    known_authors: dict[int, bool] = {}
+    chunk: list[tuple[int, CommitBatchItem]] = []
+    parent: Optional[str] = None
+    seeded = False
+
+    def insert_rows(rows) -> bool:
+        try:
+            db.execute(insert(Commit), [{k: v for k, v in row.items() if k != "index"} for row in rows])
+            bump_commits_version(db, [repo_id])
+            rollups.record_commits(db, [(repo_id, row["author_id"], row["created_at"]) for row in rows])
+            activity_controller.record_events(db, ActivityKind.COMMIT, select(
+                Commit.author_id, Commit.repository_id, Commit.id
+            ).where(Commit.hash.in_([row["hash"] for row in rows])))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    def flush_chunk():
+        nonlocal parent, seeded
+        # Resolve authors not seen in earlier chunks with a single query
+        unseen = {item.author_id for _, item in chunk} - known_authors.keys()
+        if unseen:
+            found = {row.id for row in db.query(User.id).filter(User.id.in_(unseen))}
+            known_authors.update({author_id: author_id in found for author_id in unseen})
+
+        rows = []
+        for index, item in chunk:
+            if not known_authors[item.author_id]:
+                results.append(CommitBatchResult(index=index, status="error", error="Author not found"))
+                continue
+            created_at = commit_timestamp(item.created_at)
+            if not seeded:
+                parent = db.scalar(_head_hash(repo_id, created_at if item.created_at else None))
+                seeded = True
+            # New commits always hash a nonce; imports only the one they carry
+            nonce = item.nonce or (None if item.created_at else commit_nonce())
+            parent = commit_hash(repo_id, parent, item.author_id, created_at, item.message, nonce)
+            rows.append({
+                "index": index,
+                "repository_id": repo_id,
+                "author_id": item.author_id,
+                "message": item.message,
+                "hash": parent,
+                "created_at": created_at,
+            })
+        chunk.clear()
+        if not rows:
+            return
+
+        hashes = [row["hash"] for row in rows]
+        existing: dict[str, int] = {}
+        if not insert_rows(rows):
+            # No pre-check on the happy path: only after the unique index
+            # rejects the chunk, look up which commits already exist
+            existing = dict(db.query(Commit.hash, Commit.id).filter(Commit.hash.in_(hashes)))
+            fresh = [row for row in rows if row["hash"] not in existing]
+            if fresh and not insert_rows(fresh):
+                results.extend(
+                    CommitBatchResult(index=row["index"], status="error", error="Failed to create commit")
+                    for row in fresh
+                )
+                fresh = []
+            results.extend(
+                CommitBatchResult(index=row["index"], status="duplicate", id=existing[row["hash"]], hash=row["hash"])
+                for row in rows if row["hash"] in existing
+            )
+            rows = fresh
+            if not rows:
+                return
+
+        ids = dict(db.query(Commit.hash, Commit.id).filter(Commit.hash.in_([row["hash"] for row in rows])))
+        results.extend(
+            CommitBatchResult(index=row["index"], status="created", id=ids.get(row["hash"]), hash=row["hash"])
+            for row in rows
+        )
+
+    for index, raw in enumerate(items):
+        if isinstance(raw, ndjson.MalformedLine):
+            results.append(CommitBatchResult(index=index, status="error", error=raw.error))
+            continue
+        try:
+            chunk.append((index, CommitBatchItem.model_validate(raw)))
+        except ValidationError as exc:
+            results.append(CommitBatchResult(index=index, status="error", error=str(exc.errors()[0]["msg"])))
+        if len(chunk) >= BATCH_CHUNK_SIZE:
+            flush_chunk()
+    if chunk:
+        flush_chunk()
+
+    results.sort(key=lambda result: result.index)
+    created = sum(1 for result in results if result.status == "created")
+    duplicates = sum(1 for result in results if result.status == "duplicate")
+    elapsed = time.perf_counter() - started
+    return CommitBatchResponse(
+        created=created,
+        duplicates=duplicates,
+        failed=len(results) - created - duplicates,
+        elapsed_seconds=round(elapsed, 6),
+        commits_per_second=round(created / elapsed, 1) if elapsed > 0 else 0.0,
+        results=results,
+    )
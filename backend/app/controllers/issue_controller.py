@@ -1,66 +1,214 @@
 """Issue controller - business logic for issues."""
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterator, Optional, Union
+from sqlalchemy import Select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
-from app.models.issue import Issue
+from app.models.activity import ActivityKind
+from app.models.issue import Issue, IssueStatus
 from app.models.repository import Repository
 from app.models.user import User
-from app.schemas.issue_schema import IssueCreate, IssueUpdate
+from app.schemas.issue_schema import IssueCreate, IssueUpdate, IssueResponse
+from app.utils.pagination import Page, created_between, paginate
+from app.utils.integrity import raise_for_integrity_error
+from app.utils.serialization import Projection
+from app.utils.bulk_delete import DELETE_CHUNK_SIZE
+from app.utils import cache
+from app.controllers import activity_controller
+
+ISSUE_LIST = Projection(IssueResponse, Issue)
+ISSUE_EXPORT = ISSUE_LIST.narrow(expand="")
 
 
 def get_issue(db: Session, issue_id: int) -> Issue:
     """Get an issue by ID."""
-    issue = db.query(Issue).filter(Issue.id == issue_id).first()
+    issue = db.query(Issue).options(joinedload(Issue.creator)).filter(Issue.id == issue_id).first()
     if not issue:
         raise HTTPException(status_code=404, detail="Issue not found")
     return issue
 
 
-def get_issues_by_repository(db: Session, repo_id: int, skip: int = 0, limit: int = 100, status: str = None) -> list[Issue]:
-    """Get all issues for a repository with optional status filter."""
+def get_issues_by_repository(
+    db: Session, repo_id: int, skip: int = 0, limit: int = 100, status: Optional[IssueStatus] = None,
+    cursor: Optional[str] = None, fields: Optional[str] = None, expand: Optional[str] = None
+) -> Page:
+    """Get a page of issues for a repository with optional status filter.
+
+    Filtered pages are range scans of ix_issues_repository_status_created.
+    """
     # Verify repository exists
-    repo = db.query(Repository).filter(Repository.id == repo_id).first()
+    repo = db.query(Repository.id).filter(Repository.id == repo_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
     
-    query = db.query(Issue).filter(Issue.repository_id == repo_id)
+    projection = ISSUE_LIST.narrow(fields, expand)
+    query = projection.query(db).filter(Issue.repository_id == repo_id)
     if status:
         query = query.filter(Issue.status == status)
-    return query.order_by(Issue.created_at.desc()).offset(skip).limit(limit).all()
+    page = paginate(query, Issue.created_at, Issue.id, cursor, skip, limit)
+    return page._replace(items=projection.to_dicts(page.items))
 
 
-def create_issue(db: Session, issue: IssueCreate) -> Issue:
-    """Create a new issue."""
-    # Verify repository exists
-    repo = db.query(Repository).filter(Repository.id == issue.repository_id).first()
-    if not repo:
+def iter_issues(
+    db: Session, repo_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> Iterator[dict]:
+    """Stream a repository's issues, oldest first, through a server-side cursor."""
+    query = created_between(ISSUE_EXPORT.query(db).filter(Issue.repository_id == repo_id), Issue.created_at, since, until)
+    return ISSUE_EXPORT.stream(query.order_by(Issue.created_at, Issue.id))
+
+
+def get_issues_version(db: Session, repo_id: int) -> tuple:
+    """Version stamp of a repository's issue list, with its issue counts.
+
+    Returns (open count, closed count, version, last updated_at), all read
+    from the repository row: every issue write bumps the version, so the
+    stamp costs one primary key lookup however many issues there are.
+    Raises 404 if the repository does not exist.
+    """
+    version = db.query(
+        Repository.open_issues_count,
+        Repository.closed_issues_count,
+        Repository.issues_version,
+        Repository.issues_updated_at
+    ).filter(Repository.id == repo_id).first()
+    if not version:
         raise HTTPException(status_code=404, detail="Repository not found")
-    
-    # Verify creator exists
-    creator = db.query(User).filter(User.id == issue.creator_id).first()
-    if not creator:
-        raise HTTPException(status_code=404, detail="Creator not found")
-    
+    return tuple(version)
+
+
+def bump_issues_version(
+    db: Session, repository_ids: Union[list[int], Select], open_delta: int = 0, closed_delta: int = 0
+) -> None:
+    """Bump the issue list version of the given repositories (ids, or a SELECT of ids) and add to their issue counts.
+
+    Runs as a single UPDATE inside the caller's transaction, so the version
+    and counts commit or roll back together with the issue rows. Callers
+    invalidate the cached repositories once their transaction commits.
+    """
+    db.query(Repository).filter(Repository.id.in_(repository_ids)).update(
+        {
+            Repository.open_issues_count: Repository.open_issues_count + open_delta,
+            Repository.closed_issues_count: Repository.closed_issues_count + closed_delta,
+            Repository.issues_version: Repository.issues_version + 1,
+            Repository.issues_updated_at: func.now(),
+            # Issue activity is not an edit of the repository itself
+            Repository.updated_at: Repository.updated_at,
+        },
+        synchronize_session=False
+    )
+
+
+def create_issue(db: Session, issue: IssueCreate) -> Issue:
+    """Create a new issue.
+
+    Foreign keys validate the repository and creator; they are only looked
+    up when the insert is rejected. Called with a get_create_db session, the
+    returned row is not reloaded after commit.
+    """
     db_issue = Issue(**issue.model_dump())
     db.add(db_issue)
-    db.commit()
-    db.refresh(db_issue)
+    bump_issues_version(db, [issue.repository_id], *_status_delta(issue.status))
+    try:
+        db.flush()
+        activity_controller.record_event(db, issue.creator_id, issue.repository_id, ActivityKind.ISSUE, db_issue.id)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise_for_integrity_error(
+            db,
+            [(Repository, issue.repository_id, "Repository not found"), (User, issue.creator_id, "Creator not found")],
+            "Failed to create issue"
+        )
+    cache.invalidate(cache.repository_key(issue.repository_id))
     return db_issue
 
 
 def update_issue(db: Session, issue_id: int, issue_update: IssueUpdate) -> Issue:
-    """Update an issue."""
+    """Update an issue.
+
+    A status change is written with a conditional UPDATE whose affected-row
+    count decides whether the repository's issue counters move, so
+    concurrent closes of the same issue count once. Any update bumps the
+    repository's issue list version.
+    """
     db_issue = get_issue(db, issue_id)
     update_data = issue_update.model_dump(exclude_unset=True)
+    status = update_data.pop("status", None)
     
     for key, value in update_data.items():
         setattr(db_issue, key, value)
+    delta = (0, 0)
+    if status is not None:
+        changed = db.query(Issue).filter(Issue.id == issue_id, Issue.status != status).update(
+            {Issue.status: status}, synchronize_session=False
+        )
+        if changed:
+            delta = _transition_delta(status)
+    bump_issues_version(db, [db_issue.repository_id], *delta)
     db.commit()
+    cache.invalidate(cache.issue_key(issue_id))
+    if delta != (0, 0):
+        cache.invalidate(cache.repository_key(db_issue.repository_id))
     db.refresh(db_issue)
     return db_issue
 
 
 def delete_issue(db: Session, issue_id: int) -> None:
-    """Delete an issue."""
+    """Delete an issue and take it off its repository's issue counts.
+
+    The delete is conditional on the status last read, so the count
+    decremented is the one the row was in. If a concurrent update moved the
+    issue in between, its current status is read under a row lock and the
+    delete goes again.
+    """
     db_issue = get_issue(db, issue_id)
-    db.delete(db_issue)
+    status = db_issue.status
+    while not db.query(Issue).filter(Issue.id == issue_id, Issue.status == status).delete(synchronize_session=False):
+        status = db.query(Issue.status).filter(Issue.id == issue_id).with_for_update().scalar()
+        if status is None:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Issue not found")
+    bump_issues_version(db, [db_issue.repository_id], *_status_delta(status, -1))
     db.commit()
+    cache.invalidate(cache.issue_key(issue_id), cache.repository_key(db_issue.repository_id))
+
+
+def remove_user_issues(db: Session, user_id: int, chunk_size: int = DELETE_CHUNK_SIZE) -> list[int]:
+    """Delete all of a user's issues in chunks, keeping their repositories' issue counts in step.
+
+    Each chunk commits its deletes and count updates together. Returns the
+    ids of the repositories that lost issues.
+    """
+    repository_ids = []
+    while True:
+        rows = db.query(Issue.id, Issue.repository_id, Issue.status).filter(
+            Issue.creator_id == user_id
+        ).limit(chunk_size).all()
+        if not rows:
+            return repository_ids
+        db.query(Issue).filter(Issue.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        deltas: dict[int, tuple[int, int]] = {}
+        for row in rows:
+            opened, closed = deltas.get(row.repository_id, (0, 0))
+            open_delta, closed_delta = _status_delta(row.status, -1)
+            deltas[row.repository_id] = (opened + open_delta, closed + closed_delta)
+        # One UPDATE per distinct change rather than per repository
+        by_delta: dict[tuple[int, int], list[int]] = {}
+        for repository_id, delta in deltas.items():
+            by_delta.setdefault(delta, []).append(repository_id)
+        for delta, delta_repository_ids in by_delta.items():
+            bump_issues_version(db, delta_repository_ids, *delta)
+        db.commit()
+        repository_ids.extend(deltas)
+
+
+def _status_delta(status: IssueStatus, sign: int = 1) -> tuple[int, int]:
+    """(open, closed) change from adding (or with sign -1, removing) an issue in `status`."""
+    return (sign, 0) if status == IssueStatus.OPEN else (0, sign)
+
+
+def _transition_delta(status: IssueStatus) -> tuple[int, int]:
+    """(open, closed) change from an issue moving into `status` from the other one."""
+    opened, closed = _status_delta(status)
+    return (opened - closed, closed - opened)
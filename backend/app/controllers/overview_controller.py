@@ -0,0 +1,39 @@
+"""Overview controller - everything the repository page shows, in one request."""
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.commit import Commit
+from app.models.issue import Issue
+from app.schemas.repository_schema import RepositoryResponse
+from app.controllers.repository_controller import get_repository
+from app.controllers.commit_controller import COMMIT_LIST
+from app.controllers.issue_controller import ISSUE_LIST
+from app.controllers.star_controller import is_starred
+from app.utils.pagination import paginate
+from app.utils import cache
+
+
+def get_repository_overview(db: Session, repo_id: int, user_id: Optional[int] = None, limit: int = 100) -> dict:
+    """Get a repository with its latest commits and issues and the user's star.
+
+    All reads share the request's session, so the page costs one connection
+    checkout and one round trip instead of one per resource. The repository
+    comes from the response cache; `stars_count` is part of it. `is_starred`
+    is null when no `user_id` is given.
+    """
+    repository = cache.get_or_load(
+        cache.repository_key(repo_id), RepositoryResponse, lambda: get_repository(db, repo_id), cache.repository_tags
+    )
+    commits = paginate(
+        COMMIT_LIST.query(db).filter(Commit.repository_id == repo_id), Commit.created_at, Commit.id, limit=limit
+    )
+    issues = paginate(
+        ISSUE_LIST.query(db).filter(Issue.repository_id == repo_id), Issue.created_at, Issue.id, limit=limit
+    )
+    return {
+        "repository": repository,
+        "commits": COMMIT_LIST.to_dicts(commits.items),
+        "commits_next_cursor": commits.next_cursor,
+        "issues": ISSUE_LIST.to_dicts(issues.items),
+        "issues_next_cursor": issues.next_cursor,
+        "is_starred": is_starred(db, user_id, repo_id) if user_id is not None else None,
+    }
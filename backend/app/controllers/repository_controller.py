@@ -1,52 +1,68 @@
 """Repository controller - business logic for repositories."""
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from app.models.repository import Repository
+from app.models.commit import Commit
+from app.models.issue import Issue
+from app.models.activity import ActivityEvent
+from app.models.star import Star
+from app.models.repository_stats import RepositoryAuthorStats, RepositoryDailyStats
 from app.models.user import User
-from app.schemas.repository_schema import RepositoryCreate, RepositoryUpdate
+from app.schemas.repository_schema import RepositoryCreate, RepositoryUpdate, RepositoryResponse
+from app.utils.pagination import Page, paginate
+from app.utils.serialization import Projection
+from app.utils import cache, search_index
+from app.utils.bulk_delete import delete_in_chunks
+from app.utils.integrity import raise_for_integrity_error, unique_violation
+from app.controllers import activity_controller
+
+REPOSITORY_LIST = Projection(RepositoryResponse, Repository)
 
 
 def get_repository(db: Session, repo_id: int) -> Repository:
     """Get a repository by ID."""
-    repo = db.query(Repository).filter(Repository.id == repo_id).first()
+    repo = db.query(Repository).options(joinedload(Repository.owner)).filter(Repository.id == repo_id).first()
     if not repo:
         raise HTTPException(status_code=404, detail="Repository not found")
     return repo
 
 
-def get_repositories(db: Session, skip: int = 0, limit: int = 100, owner_id: int = None) -> list[Repository]:
-    """Get all repositories with optional filtering by owner."""
-    query = db.query(Repository)
+def get_repositories(
+    db: Session, skip: int = 0, limit: int = 100, owner_id: int = None, cursor: Optional[str] = None,
+    fields: Optional[str] = None, expand: Optional[str] = None
+) -> Page:
+    """Get a page of repositories, newest first, with optional filtering by owner."""
+    projection = REPOSITORY_LIST.narrow(fields, expand)
+    query = projection.query(db)
     if owner_id:
         query = query.filter(Repository.owner_id == owner_id)
-    return query.offset(skip).limit(limit).all()
+    page = paginate(query, Repository.created_at, Repository.id, cursor, skip, limit)
+    return page._replace(items=projection.to_dicts(page.items))
 
 
 def create_repository(db: Session, repo: RepositoryCreate) -> Repository:
-    """Create a new repository."""
-    # Verify owner exists
-    owner = db.query(User).filter(User.id == repo.owner_id).first()
-    if not owner:
-        raise HTTPException(status_code=404, detail="Owner not found")
-    
-    # Check if repository name already exists for this owner
-    existing = db.query(Repository).filter(
-        Repository.owner_id == repo.owner_id,
-        Repository.name == repo.name
-    ).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Repository name already exists for this owner")
-    
+    """Create a new repository.
+
+    The owner foreign key and the unique (owner_id, name) constraint validate
+    the insert. A rejected insert is a duplicate name only when that
+    constraint reports it; otherwise the owner is looked up to answer 404.
+    Called with a get_create_db session, the returned row is not reloaded
+    after commit.
+    """
     try:
         db_repo = Repository(**repo.model_dump())
         db.add(db_repo)
+        db.flush()
+        search_index.index_repository(db, db_repo)
         db.commit()
-        db.refresh(db_repo)
         return db_repo
-    except IntegrityError:
+    except IntegrityError as error:
         db.rollback()
-        raise HTTPException(status_code=400, detail="Failed to create repository")
+        if unique_violation(error, Repository, "uq_repositories_owner_name"):
+            raise HTTPException(status_code=400, detail="Repository name already exists for this owner")
+        raise_for_integrity_error(db, [(User, repo.owner_id, "Owner not found")], "Failed to create repository")
 
 
 def update_repository(db: Session, repo_id: int, repo_update: RepositoryUpdate) -> Repository:
@@ -67,16 +83,46 @@ def update_repository(db: Session, repo_id: int, repo_update: RepositoryUpdate)
     try:
         for key, value in update_data.items():
             setattr(db_repo, key, value)
+        db.flush()
+        search_index.index_repository(db, db_repo)
         db.commit()
-        db.refresh(db_repo)
-        return db_repo
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Failed to update repository")
 
+    cache.invalidate(cache.repository_key(repo_id))
+    db.refresh(db_repo)
+    return db_repo
+
+
+def purge_repository_contents(db: Session, repo_id: int) -> None:
+    """Delete a repository's activity, commits, issues and stars in committed chunks, then its daily stats."""
+    activity_controller.purge_events(db, ActivityEvent.repository_id == repo_id)
+    for model in (Commit, Issue, Star):
+        delete_in_chunks(db, model, model.repository_id == repo_id)
+    # One row per active day or author, so a single statement each
+    db.query(RepositoryDailyStats).filter(RepositoryDailyStats.repository_id == repo_id).delete(synchronize_session=False)
+    db.query(RepositoryAuthorStats).filter(RepositoryAuthorStats.repository_id == repo_id).delete(synchronize_session=False)
+    db.commit()
+
 
 def delete_repository(db: Session, repo_id: int) -> None:
-    """Delete a repository."""
+    """Delete a repository.
+
+    The contents are purged in committed chunks first; if that is
+    interrupted, the repository stays and deleting it again resumes.
+    """
     db_repo = get_repository(db, repo_id)
+    purge_repository_contents(db, repo_id)
+    search_index.remove_repositories(db, [repo_id])
     db.delete(db_repo)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A commit, issue or star was written while the purge ran
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Repository changed while being deleted, please retry")
+
+    # Commits and issues are deleted with the repository
+    cache.invalidate(cache.repository_key(repo_id))
+    cache.invalidate_tags(cache.repository_tag(repo_id))
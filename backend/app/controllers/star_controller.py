@@ -1,55 +1,203 @@
 """Star controller - business logic for stars."""
+from collections import Counter
+from typing import Iterable, NamedTuple, Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select, tuple_
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
+from app.config import settings
+from app.models.activity import ActivityKind
 from app.models.star import Star
 from app.models.repository import Repository
 from app.models.user import User
+from app.utils.pagination import Page, paginate
+from app.utils import cache, rollups
+from app.utils.bulk_delete import DELETE_CHUNK_SIZE
+from app.utils.integrity import missing_reference, raise_for_integrity_error
+from app.utils.upsert import insert_ignore
+from app.controllers import activity_controller
+from app.controllers.repository_controller import REPOSITORY_LIST
 
+# Columns of the unique_user_repo_star constraint
+STAR_KEY = ["user_id", "repository_id"]
 
-def star_repository(db: Session, user_id: int, repository_id: int) -> Star:
-    """Star a repository."""
-    # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Verify repository exists
-    repo = db.query(Repository).filter(Repository.id == repository_id).first()
-    if not repo:
-        raise HTTPException(status_code=404, detail="Repository not found")
-    
-    # Check if already starred
-    existing = db.query(Star).filter(
-        Star.user_id == user_id,
-        Star.repository_id == repository_id
-    ).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Repository already starred")
-    
+
+class StarResult(NamedTuple):
+    """Outcome of star_repository: the star's id and whether this call created it."""
+    star_id: int
+    created: bool
+
+
+def star_repository(db: Session, user_id: int, repository_id: int) -> StarResult:
+    """Star a repository; starring it again is a no-op.
+
+    A single INSERT ... ON CONFLICT DO NOTHING decides whether this call
+    created the star, and the counter is bumped only if it did, so
+    concurrent double clicks cannot count twice. The user and repository
+    are only looked up when nothing was inserted.
+    """
+    refs = [(User, user_id, "User not found"), (Repository, repository_id, "Repository not found")]
     try:
-        star = Star(user_id=user_id, repository_id=repository_id)
-        db.add(star)
+        result = insert_ignore(db, Star, [{"user_id": user_id, "repository_id": repository_id}], STAR_KEY)
+        if result.rowcount:
+            adjust_stars_count(db, [repository_id], 1)
+            rollups.record_stars(db, {repository_id: 1})
+            activity_controller.record_event(
+                db, user_id, repository_id, ActivityKind.STAR, result.inserted_primary_key[0]
+            )
+            star_id = result.inserted_primary_key[0]
+        else:
+            # Read the existing star before committing: the skipped INSERT
+            # still holds the row (InnoDB keeps a shared lock on the
+            # duplicate key, SQLite the write lock), so a concurrent unstar
+            # cannot remove it in between
+            star_id = db.query(Star.id).filter(Star.user_id == user_id, Star.repository_id == repository_id).scalar()
         db.commit()
-        db.refresh(star)
-        return star
     except IntegrityError:
         db.rollback()
-        raise HTTPException(status_code=400, detail="Failed to star repository")
+        raise_for_integrity_error(db, refs, "Failed to star repository")
+    if result.rowcount:
+        cache.invalidate(cache.repository_key(repository_id))
+        return StarResult(star_id, True)
+    if star_id is not None:
+        return StarResult(star_id, False)
+    # Nothing inserted and nothing found: MySQL's INSERT IGNORE skipped a row
+    # whose user or repository does not exist. (PostgreSQL does not lock on
+    # conflict, so there a concurrent unstar can also land here.)
+    not_found = missing_reference(db, refs)
+    if not_found:
+        raise HTTPException(status_code=404, detail=not_found)
+    raise HTTPException(status_code=409, detail="Star changed concurrently, please retry")
 
 
-def unstar_repository(db: Session, user_id: int, repository_id: int) -> None:
-    """Unstar a repository."""
-    star = db.query(Star).filter(
+def unstar_repository(db: Session, user_id: int, repository_id: int) -> bool:
+    """Unstar a repository; unstarring one that is not starred is a no-op.
+
+    The DELETE's affected-row count decides whether the counter is
+    decremented. Returns whether a star was removed.
+    """
+    deleted = db.query(Star).filter(
         Star.user_id == user_id,
         Star.repository_id == repository_id
-    ).first()
-    
-    if not star:
-        raise HTTPException(status_code=404, detail="Star not found")
-    
-    db.delete(star)
+    ).delete(synchronize_session=False)
+    if deleted:
+        adjust_stars_count(db, [repository_id], -1)
+        rollups.record_stars(db, {repository_id: -1})
     db.commit()
+    if deleted:
+        cache.invalidate(cache.repository_key(repository_id))
+    return bool(deleted)
+
+
+def apply_star_batch(db: Session, star: Iterable[tuple[int, int]], unstar: Iterable[tuple[int, int]]) -> dict:
+    """Star and unstar many (user_id, repository_id) pairs for import tools.
+
+    Pairs naming a missing user or repository are reported in `not_found`;
+    pairs already in the requested state count as `unchanged`. Stars are
+    written with one INSERT ... ON CONFLICT DO NOTHING and one DELETE, and
+    counters with one UPDATE per distinct delta, all in one transaction.
+    If a concurrent request changed some of the same pairs, the affected
+    row counts no longer match and the batch is redone pair by pair, so
+    counters stay exact either way.
+    """
+    star, unstar = set(star), set(unstar)
+    if star & unstar:
+        raise HTTPException(status_code=400, detail="A pair cannot be both starred and unstarred")
+    pairs = star | unstar
+    users = {pair[0] for pair in pairs}
+    repositories = {pair[1] for pair in pairs}
+    found_users = {row.id for row in db.query(User.id).filter(User.id.in_(users))} if users else set()
+    found_repositories = {
+        row.id for row in db.query(Repository.id).filter(Repository.id.in_(repositories))
+    } if repositories else set()
+    not_found = sorted(pair for pair in pairs if pair[0] not in found_users or pair[1] not in found_repositories)
+    star -= set(not_found)
+    unstar -= set(not_found)
+
+    existing = _existing_stars(db, star | unstar)
+    to_insert = sorted(star - existing)
+    to_delete = sorted(unstar & existing)
+    try:
+        inserted = insert_ignore(
+            db, Star, [{"user_id": u, "repository_id": r} for u, r in to_insert], STAR_KEY
+        ).rowcount if to_insert else 0
+        deleted = _delete_stars(db, to_delete) if to_delete else 0
+        exact = inserted == len(to_insert) and deleted == len(to_delete)
+        if exact:
+            deltas = Counter(r for _, r in to_insert)
+            deltas.subtract(r for _, r in to_delete)
+            _apply_deltas(db, deltas)
+            if to_insert:
+                activity_controller.record_events(db, ActivityKind.STAR, select(
+                    Star.user_id, Star.repository_id, Star.id
+                ).where(tuple_(Star.user_id, Star.repository_id).in_(to_insert)))
+            db.commit()
+    except IntegrityError:
+        exact = False
+    if not exact:
+        db.rollback()
+        inserted, deleted = _apply_pairwise(db, sorted(star), sorted(unstar))
+    if inserted or deleted:
+        for repository_id in {r for _, r in star | unstar}:
+            cache.invalidate(cache.repository_key(repository_id))
+    return {
+        "starred": inserted,
+        "unstarred": deleted,
+        "unchanged": len(star) + len(unstar) - inserted - deleted,
+        "not_found": [{"user_id": u, "repository_id": r} for u, r in not_found],
+    }
+
+
+def _existing_stars(db: Session, pairs: set) -> set:
+    if not pairs:
+        return set()
+    rows = db.query(Star.user_id, Star.repository_id).filter(
+        tuple_(Star.user_id, Star.repository_id).in_(pairs)
+    )
+    return {(row.user_id, row.repository_id) for row in rows}
+
+
+def _delete_stars(db: Session, pairs: list) -> int:
+    return db.query(Star).filter(
+        tuple_(Star.user_id, Star.repository_id).in_(pairs)
+    ).delete(synchronize_session=False)
+
+
+def _apply_deltas(db: Session, deltas: Counter) -> None:
+    by_delta: dict[int, list[int]] = {}
+    for repository_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(repository_id)
+    for delta, repository_ids in by_delta.items():
+        adjust_stars_count(db, repository_ids, delta)
+    rollups.record_stars(db, deltas)
+
+
+def _apply_pairwise(db: Session, star: list, unstar: list) -> tuple[int, int]:
+    # Slow path: one short transaction per pair, each deciding from its own
+    # affected-row count whether to touch the counter
+    inserted = deleted = 0
+    for user_id, repository_id in star:
+        try:
+            result = insert_ignore(db, Star, [{"user_id": user_id, "repository_id": repository_id}], STAR_KEY)
+            if result.rowcount:
+                adjust_stars_count(db, [repository_id], 1)
+                rollups.record_stars(db, {repository_id: 1})
+                activity_controller.record_event(
+                    db, user_id, repository_id, ActivityKind.STAR, result.inserted_primary_key[0]
+                )
+                inserted += 1
+            db.commit()
+        except IntegrityError:
+            # The user or repository was deleted meanwhile
+            db.rollback()
+    for user_id, repository_id in unstar:
+        if _delete_stars(db, [(user_id, repository_id)]):
+            adjust_stars_count(db, [repository_id], -1)
+            rollups.record_stars(db, {repository_id: -1})
+            deleted += 1
+        db.commit()
+    return inserted, deleted
 
 
 def is_starred(db: Session, user_id: int, repository_id: int) -> bool:
@@ -61,13 +209,112 @@ def is_starred(db: Session, user_id: int, repository_id: int) -> bool:
     return star is not None
 
 
-def get_starred_repositories(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> list[Repository]:
-    """Get all repositories starred by a user."""
-    return db.query(Repository).join(Star).filter(
-        Star.user_id == user_id
-    ).offset(skip).limit(limit).all()
+def get_starred_ids(db: Session, user_id: int, repository_ids: list[int]) -> set[int]:
+    """Return which of `repository_ids` a user has starred, using a single query."""
+    if not repository_ids:
+        return set()
+    rows = db.query(Star.repository_id).filter(
+        Star.user_id == user_id,
+        Star.repository_id.in_(repository_ids)
+    ).all()
+    return {row.repository_id for row in rows}
+
+
+def get_starred_repositories(
+    db: Session, user_id: int, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+    fields: Optional[str] = None, expand: Optional[str] = None
+) -> Page:
+    """Get a page of repositories starred by a user, most recently starred first."""
+    projection = REPOSITORY_LIST.narrow(fields, expand)
+    query = projection.query(db).join(Star, Star.repository_id == Repository.id).filter(Star.user_id == user_id)
+    page = paginate(query, Star.created_at, Star.id, cursor, skip, limit)
+    return page._replace(items=projection.to_dicts(page.items))
 
 
 def get_repository_stars_count(db: Session, repository_id: int) -> int:
     """Get the number of stars for a repository."""
-    return db.query(Star).filter(Star.repository_id == repository_id).count()
+    count = db.query(Repository.stars_count).filter(Repository.id == repository_id).scalar()
+    return count or 0
+
+
+def remove_user_stars(db: Session, user_id: int, chunk_size: int = DELETE_CHUNK_SIZE) -> list[int]:
+    """Delete all of a user's stars in chunks, decrementing each repository's counter.
+
+    Each chunk commits its deletes and counter updates together. Returns the
+    ids of the repositories whose counters changed.
+    """
+    repository_ids = []
+    while True:
+        rows = db.query(Star.id, Star.repository_id).filter(Star.user_id == user_id).limit(chunk_size).all()
+        if not rows:
+            return repository_ids
+        db.query(Star).filter(Star.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        chunk_repository_ids = [row.repository_id for row in rows]
+        adjust_stars_count(db, chunk_repository_ids, -1)
+        rollups.record_stars(db, {repository_id: -1 for repository_id in chunk_repository_ids})
+        db.commit()
+        repository_ids.extend(chunk_repository_ids)
+
+
+def adjust_stars_count(db: Session, repository_ids, delta: int) -> None:
+    """Atomically add `delta` to the star counter of the given repositories.
+
+    Runs as a single UPDATE inside the caller's transaction, so the counter
+    commits or rolls back together with the star rows. `repository_ids` may
+    be a list or a subquery of ids. Callers invalidate the cached repositories
+    once their transaction commits.
+
+    The same UPDATE sets the sticky feed_fanout_on_read flag once the count
+    exceeds FEED_FANOUT_MAX_STARS, so the flag never lags the counter.
+    """
+    db.query(Repository).filter(Repository.id.in_(repository_ids)).update(
+        {
+            Repository.stars_count: Repository.stars_count + delta,
+            Repository.feed_fanout_on_read: or_(
+                Repository.feed_fanout_on_read,
+                Repository.stars_count + delta > settings.FEED_FANOUT_MAX_STARS
+            ),
+            # Starring is not an edit of the repository itself
+            Repository.updated_at: Repository.updated_at,
+        },
+        synchronize_session=False
+    )
+
+
+def reconcile_stars_counts(db: Session, chunk_size: int = 10000) -> int:
+    """Rebuild every repository's stars_count from the stars table.
+
+    Works through repositories in id ranges of `chunk_size`, committing each
+    range separately to keep transactions short. Only the corrected
+    repositories are dropped from the cache. Returns the number of
+    repositories whose counter was corrected.
+    """
+    max_id = db.query(func.max(Repository.id)).scalar() or 0
+    actual = (
+        select(func.count(Star.id))
+        .where(Star.repository_id == Repository.id)
+        .correlate(Repository)
+        .scalar_subquery()
+    )
+    corrected = 0
+    for start in range(0, max_id + 1, chunk_size):
+        drifted = [repo_id for repo_id, in db.query(Repository.id).filter(
+            Repository.id >= start,
+            Repository.id < start + chunk_size,
+            Repository.stars_count != actual
+        )]
+        if not drifted:
+            continue
+        corrected += db.query(Repository).filter(Repository.id.in_(drifted)).update(
+            {
+                Repository.stars_count: actual,
+                Repository.feed_fanout_on_read: or_(
+                    Repository.feed_fanout_on_read, actual > settings.FEED_FANOUT_MAX_STARS
+                ),
+                Repository.updated_at: Repository.updated_at,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        cache.invalidate(*(cache.repository_key(repo_id) for repo_id in drifted))
+    return corrected
@@ -0,0 +1,164 @@
+"""Stats controller - repository statistics read from incremental rollups."""
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import Integer, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from app.models.commit import Commit
+from app.models.issue import Issue, IssueStatus
+from app.models.repository import Repository
+from app.models.repository_stats import RepositoryAuthorStats, RepositoryDailyStats
+from app.models.star import Star
+from app.schemas.repository_schema import AuthorCommits
+from app.utils.serialization import Projection
+from app.utils import rollups
+
+AUTHOR_LIST = Projection(AuthorCommits, RepositoryAuthorStats)
+
+# Repositories rebuilt per transaction by rebuild_repository_stats
+REBUILD_CHUNK_SIZE = 500
+
+
+def get_repository_stats(
+    db: Session, repo_id: int, days: int = 30, authors: int = 10, today: Optional[date] = None
+) -> dict:
+    """Get a repository's commit, issue, star and author statistics.
+
+    Reads the repository's counters, its daily buckets for the window (at
+    most `days` plus six rows, to complete the first week) and the top
+    `authors` from an index, so the cost does not grow with the number of
+    commits, issues or stars.
+    """
+    repo = db.query(
+        Repository.id, Repository.stars_count, Repository.open_issues_count, Repository.closed_issues_count
+    ).filter(Repository.id == repo_id).first()
+    if not repo:
+        raise HTTPException(status_code=404, detail="Repository not found")
+
+    today = today or rollups.utc_today()
+    since = today - timedelta(days=days - 1)
+    week_start = since - timedelta(days=since.weekday())
+    buckets = {
+        row.day: row for row in db.query(
+            RepositoryDailyStats.day, RepositoryDailyStats.commits, RepositoryDailyStats.stars
+        ).filter(
+            RepositoryDailyStats.repository_id == repo_id,
+            RepositoryDailyStats.day >= week_start,
+            RepositoryDailyStats.day <= today
+        )
+    }
+    top_authors = AUTHOR_LIST.to_dicts(
+        AUTHOR_LIST.query(db).filter(
+            RepositoryAuthorStats.repository_id == repo_id
+        ).order_by(
+            RepositoryAuthorStats.commits.desc(), RepositoryAuthorStats.author_id.desc()
+        ).limit(authors)
+    )
+
+    window = [since + timedelta(days=offset) for offset in range(days)]
+    commits_per_day = [{"day": day, "count": _bucket(buckets, day, "commits")} for day in window]
+    weeks: dict[date, int] = {}
+    for offset in range((today - week_start).days + 1):
+        day = week_start + timedelta(days=offset)
+        monday = day - timedelta(days=day.weekday())
+        weeks[monday] = weeks.get(monday, 0) + _bucket(buckets, day, "commits")
+
+    # stars_count is the total at the end of today; walk back through the net gains
+    star_growth = []
+    total = repo.stars_count
+    for day in reversed(window):
+        gained = _bucket(buckets, day, "stars")
+        star_growth.append({"day": day, "stars": gained, "total": total})
+        total -= gained
+    star_growth.reverse()
+
+    return {
+        "repository_id": repo_id,
+        "since": since,
+        "until": today,
+        "commits_per_day": commits_per_day,
+        "commits_per_week": [{"week": week, "count": count} for week, count in weeks.items()],
+        "issues": {"open": repo.open_issues_count, "closed": repo.closed_issues_count},
+        "top_authors": top_authors,
+        "star_growth": star_growth,
+    }
+
+
+def _bucket(buckets: dict, day: date, column: str) -> int:
+    row = buckets.get(day)
+    return getattr(row, column) if row else 0
+
+
+def rebuild_repository_stats(
+    db: Session, repository_ids: Optional[list[int]] = None, chunk_size: int = REBUILD_CHUNK_SIZE
+) -> int:
+    """Rebuild the rollups and issue counters of repositories from their history.
+
+    For backfilling activity recorded before the rollups existed, or
+    correcting drift. Each chunk of repositories has its buckets deleted and
+    rewritten by one INSERT ... SELECT per table and its issue counters
+    recounted, all aggregated by the database, and commits on its own.
+    History only keeps current rows, so rebuilt star buckets count the stars
+    that still exist on the day they were made. Returns the number of
+    repositories rebuilt.
+    """
+    rebuilt = 0
+    last_id = 0
+    while True:
+        query = db.query(Repository.id).filter(Repository.id > last_id)
+        if repository_ids is not None:
+            query = query.filter(Repository.id.in_(repository_ids))
+        ids = [repo_id for repo_id, in query.order_by(Repository.id).limit(chunk_size)]
+        if not ids:
+            return rebuilt
+        db.query(RepositoryDailyStats).filter(RepositoryDailyStats.repository_id.in_(ids)).delete(synchronize_session=False)
+        db.query(RepositoryAuthorStats).filter(RepositoryAuthorStats.repository_id.in_(ids)).delete(synchronize_session=False)
+        _insert_daily_history(db, ids)
+        db.execute(insert(RepositoryAuthorStats).from_select(
+            ["repository_id", "author_id", "commits"],
+            select(Commit.repository_id, Commit.author_id, func.count()).where(
+                Commit.repository_id.in_(ids)
+            ).group_by(Commit.repository_id, Commit.author_id)
+        ))
+        _recount_issues(db, ids)
+        db.commit()
+        rebuilt += len(ids)
+        last_id = ids[-1]
+
+
+def _insert_daily_history(db: Session, repository_ids: list[int]) -> None:
+    # One grouped SELECT per source table, each filling its own counters,
+    # summed into a single row per repository and day
+    def grouped(model, counter):
+        day = func.date(model.created_at)
+        return select(
+            model.repository_id.label("repository_id"),
+            day.label("day"),
+            *((func.count() if name == counter else literal(0, Integer)).label(name) for name in counters)
+        ).where(model.repository_id.in_(repository_ids)).group_by(model.repository_id, day)
+
+    counters = ["commits", "stars"]
+    history = union_all(grouped(Commit, "commits"), grouped(Star, "stars")).subquery()
+    db.execute(insert(RepositoryDailyStats).from_select(
+        ["repository_id", "day", *counters],
+        select(
+            history.c.repository_id, history.c.day, *(func.sum(history.c[name]) for name in counters)
+        ).group_by(history.c.repository_id, history.c.day)
+    ))
+
+
+def _recount_issues(db: Session, repository_ids: list[int]) -> None:
+    def count(status):
+        return select(func.count()).where(
+            Issue.repository_id == Repository.id, Issue.status == status
+        ).scalar_subquery()
+
+    db.query(Repository).filter(Repository.id.in_(repository_ids)).update(
+        {
+            Repository.open_issues_count: count(IssueStatus.OPEN),
+            Repository.closed_issues_count: count(IssueStatus.CLOSED),
+            Repository.issues_version: Repository.issues_version + 1,
+            Repository.updated_at: Repository.updated_at,
+        },
+        synchronize_session=False
+    )
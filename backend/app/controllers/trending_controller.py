@@ -0,0 +1,86 @@
+"""Trending controller - precomputed repository leaderboards."""
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.leaderboard import LeaderboardEntry
+from app.models.repository import Repository
+from app.models.repository_stats import RepositoryDailyStats
+from app.controllers.repository_controller import REPOSITORY_LIST
+from app.utils import rollups
+
+# Daily buckets per window, counting today; None ranks by all-time stars
+WINDOWS = {"day": 1, "week": 7, "all": None}
+
+
+def get_trending(db: Session, window: str, limit: int = 25) -> list[dict]:
+    """Read the top `limit` repositories of a leaderboard.
+
+    A primary key range scan of at most `limit` entries joined to their
+    repositories, whatever the size of the commits and stars tables.
+    """
+    entries = REPOSITORY_LIST.query(db).join(
+        LeaderboardEntry, LeaderboardEntry.repository_id == Repository.id
+    ).add_columns(
+        LeaderboardEntry.position, LeaderboardEntry.stars, LeaderboardEntry.commits
+    ).filter(
+        LeaderboardEntry.period == window
+    ).order_by(LeaderboardEntry.position).limit(limit).all()
+    repositories = REPOSITORY_LIST.to_dicts(entries)
+    return [
+        {"rank": row[-3], "stars": row[-2], "commits": row[-1], "repository": repository}
+        for row, repository in zip(entries, repositories)
+    ]
+
+
+def refresh_leaderboards(db: Session, size: Optional[int] = None, today: Optional[date] = None) -> dict[str, int]:
+    """Rebuild every leaderboard from the daily rollups.
+
+    Each window is ranked with one aggregate over its buckets (at most one
+    row per active repository per day) and replaced in its own transaction,
+    so readers always see a complete leaderboard. Returns the number of
+    entries written per window.
+    """
+    size = size or settings.LEADERBOARD_SIZE
+    today = today or rollups.utc_today()
+    written = {}
+    for window, days in WINDOWS.items():
+        ranked = _rank_all_time(db, size) if days is None else _rank_since(db, today - timedelta(days=days - 1), size)
+        db.query(LeaderboardEntry).filter(LeaderboardEntry.period == window).delete(synchronize_session=False)
+        if ranked:
+            db.execute(insert(LeaderboardEntry), [
+                {"period": window, "position": position, "repository_id": repository_id, "stars": stars, "commits": commits}
+                for position, (repository_id, stars, commits) in enumerate(ranked, start=1)
+            ])
+        db.commit()
+        written[window] = len(ranked)
+    return written
+
+
+def _rank_since(db: Session, start: date, size: int) -> list[tuple]:
+    # Groups and sorts the window's buckets (repositories active in it),
+    # which is bounded by recent activity rather than history
+    stars = func.sum(RepositoryDailyStats.stars)
+    commits = func.sum(RepositoryDailyStats.commits)
+    return db.query(RepositoryDailyStats.repository_id, stars, commits).join(
+        Repository, Repository.id == RepositoryDailyStats.repository_id
+    ).filter(
+        RepositoryDailyStats.day >= start,
+        Repository.is_public.is_(True)
+    ).group_by(RepositoryDailyStats.repository_id).having(
+        or_(stars > 0, commits > 0)
+    ).order_by(stars.desc(), commits.desc(), RepositoryDailyStats.repository_id).limit(size).all()
+
+
+def _rank_all_time(db: Session, size: int) -> list[tuple]:
+    # stars_count is exact, so all-time ranking walks ix_repositories_public_stars
+    top = db.query(Repository.id, Repository.stars_count).filter(
+        Repository.is_public.is_(True)
+    ).order_by(Repository.stars_count.desc(), Repository.id.desc()).limit(size).all()
+    commits = dict(
+        db.query(RepositoryDailyStats.repository_id, func.sum(RepositoryDailyStats.commits)).filter(
+            RepositoryDailyStats.repository_id.in_([row.id for row in top])
+        ).group_by(RepositoryDailyStats.repository_id).all()
+    ) if top else {}
+    return [(row.id, row.stars_count, commits.get(row.id, 0)) for row in top]
@@ -1,9 +1,24 @@
 """User controller - business logic for users."""
+from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from app.models.user import User
-from app.schemas.user_schema import UserCreate, UserUpdate
+from app.models.commit import Commit
+from app.models.issue import Issue
+from app.models.repository import Repository
+from app.models.repository_stats import RepositoryAuthorStats
+from app.models.activity import ActivityEvent
+from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
+from app.utils.pagination import Page, paginate
+from app.utils.serialization import Projection
+from app.utils import cache, search_index
+from app.controllers import activity_controller, commit_controller, issue_controller
+from app.controllers.star_controller import remove_user_stars
+from app.controllers.repository_controller import purge_repository_contents
+
+USER_LIST = Projection(UserResponse, User)
 
 
 def get_user(db: Session, user_id: int) -> User:
@@ -22,9 +37,13 @@ def get_user_by_username(db: Session, username: str) -> User:
     return user
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> list[User]:
-    """Get all users with pagination."""
-    return db.query(User).offset(skip).limit(limit).all()
+def get_users(
+    db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None, fields: Optional[str] = None
+) -> Page:
+    """Get a page of users, newest first."""
+    projection = USER_LIST.narrow(fields)
+    page = paginate(projection.query(db), User.created_at, User.id, cursor, skip, limit)
+    return page._replace(items=projection.to_dicts(page.items))
 
 
 def create_user(db: Session, user: UserCreate) -> User:
@@ -32,6 +51,8 @@ def create_user(db: Session, user: UserCreate) -> User:
     try:
         db_user = User(**user.model_dump())
         db.add(db_user)
+        db.flush()
+        search_index.index_user(db, db_user)
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -41,23 +62,79 @@ def create_user(db: Session, user: UserCreate) -> User:
 
 
 def update_user(db: Session, user_id: int, user_update: UserUpdate) -> User:
-    """Update a user."""
+    """Update a user.
+
+    Commit and issue list bodies embed their author or creator, so an update
+    also bumps the list versions of every repository the user committed to
+    or opened issues in, and drops the cached entries embedding the user.
+    """
     db_user = get_user(db, user_id)
+    old_username = db_user.username
     update_data = user_update.model_dump(exclude_unset=True)
     
     try:
         for key, value in update_data.items():
             setattr(db_user, key, value)
+        db.flush()
+        search_index.index_user(db, db_user)
+        if update_data:
+            _bump_list_versions(db, user_id)
         db.commit()
-        db.refresh(db_user)
-        return db_user
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Username or email already exists")
 
+    cache.invalidate(cache.user_key(user_id), cache.username_key(old_username))
+    # Cached repositories, commits and issues embedding the user
+    cache.invalidate_tags(cache.user_tag(user_id))
+    db.refresh(db_user)
+    return db_user
+
+
+def _bump_list_versions(db: Session, user_id: int) -> None:
+    # Repositories selected in the UPDATE itself, through the author / creator indexes
+    commit_controller.bump_commits_version(db, select(Commit.repository_id).where(Commit.author_id == user_id))
+    issue_controller.bump_issues_version(db, select(Issue.repository_id).where(Issue.creator_id == user_id))
+
 
 def delete_user(db: Session, user_id: int) -> None:
-    """Delete a user."""
+    """Delete a user.
+
+    Runs in phases that each commit, so a delete interrupted part way leaves
+    the user in place with some of their content gone. Every phase only
+    deletes what is still there, so calling this again finishes the job.
+    Caches are invalidated as each phase commits, keeping counters read
+    from the cache in step even if the delete never completes.
+    """
     db_user = get_user(db, user_id)
+    username = db_user.username
+    repo_ids = [repo_id for repo_id, in db.query(Repository.id).filter(Repository.owner_id == user_id)]
+    # The user's stars are removed with them; keep other repositories' counters in step
+    starred_ids = remove_user_stars(db, user_id)
+    cache.invalidate(*(cache.repository_key(repo_id) for repo_id in starred_ids))
+    for repo_id in repo_ids:
+        purge_repository_contents(db, repo_id)
+    # Their commits and issues in other users' repositories
+    commit_controller.remove_user_commits(db, user_id)
+    issue_repo_ids = issue_controller.remove_user_issues(db, user_id)
+    cache.invalidate(*(cache.repository_key(repo_id) for repo_id in issue_repo_ids))
+    # They leave the top authors; the daily commit counts keep their history
+    db.query(RepositoryAuthorStats).filter(RepositoryAuthorStats.author_id == user_id).delete(synchronize_session=False)
+    # Their events in other users' feeds, then their own feed
+    activity_controller.purge_events(db, ActivityEvent.actor_id == user_id)
+    activity_controller.purge_timeline(db, user_id)
+
+    search_index.remove_repositories(db, repo_ids)
+    search_index.remove_users(db, [user_id])
+    db.query(Repository).filter(Repository.owner_id == user_id).delete(synchronize_session=False)
     db.delete(db_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Something referencing the user was written while the purge ran
+        db.rollback()
+        raise HTTPException(status_code=409, detail="User changed while being deleted, please retry")
+
+    cache.invalidate(cache.user_key(user_id), cache.username_key(username))
+    # Their repositories, their commits and issues anywhere, and everything in their repositories
+    cache.invalidate_tags(cache.user_tag(user_id), *(cache.repository_tag(repo_id) for repo_id in repo_ids))
@@ -1,19 +1,87 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.utils import metrics
+from app.utils.explain import install_explain_checker
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False
-)
 
-# Create session factory
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.record_pool_wait(time.perf_counter() - started)
+
+
+def _engine_options(url: str) -> dict:
+    """Pool options for `url`, sized from settings."""
+    parsed = make_url(url)
+    # In-memory SQLite must keep its default single-connection pool
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_engine(url: str):
+    db_engine = create_engine(url, pool_pre_ping=True, echo=False, **_engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        # Write controllers rely on foreign keys to reject dangling references
+        event.listen(db_engine, "connect", _enable_sqlite_foreign_keys)
+    metrics.instrument_engine(db_engine)
+    if settings.DB_EXPLAIN_CHECK:
+        install_explain_checker(db_engine)
+    return db_engine
+
+
+# Create database engines; reads use the replica when one is configured
+engine = _create_engine(settings.DATABASE_URL)
+read_engine = _create_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
+
+
+class RoutingSession(Session):
+    """Session that reads from the replica until it writes, then sticks to the primary.
+
+    Once the session has flushed or executed an INSERT/UPDATE/DELETE, every
+    later statement goes to the primary, so reads within the same request
+    never observe replication lag for their own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+        if self.info.get("wrote"):
+            return engine
+        return read_engine
+
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, class_=RoutingSession)
+# For routes that return the row they just created: objects keep their loaded
+# state after commit, so the row is returned without re-selecting it (server
+# defaults come back via RETURNING). Only safe when nothing else in the
+# request relies on reloading state after the commit.
+CreateSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -26,3 +94,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_create_db():
+    """Dependency to get a session whose objects are not expired on commit (create routes)."""
+    db = CreateSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """Dependency to get a session for read endpoints (replica-routed)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,25 +1,75 @@
 """FastAPI application entry point."""
+import asyncio
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils import cache, metrics, rate_limit
+from app.utils.background import run_periodically
+from app.utils.http_cache import VALIDATOR_HEADERS
+from app.database import engine, Base, SessionLocal
+from app.controllers import trending_controller
 from app.views import (
     user_routes,
     repository_routes,
     commit_routes,
     issue_routes,
     search_routes,
-    star_routes
+    star_routes,
+    activity_routes
 )
+from app.views.issue_routes import OPEN_ISSUES_HEADER, CLOSED_ISSUES_HEADER
 
-# Create database tables
+# Create database tables (on SQLite, including the search index; see app.utils.search_index)
 Base.metadata.create_all(bind=engine)
 
+
+def refresh_leaderboards():
+    """Rebuild the trending leaderboards in a session of their own."""
+    db = SessionLocal()
+    try:
+        trending_controller.refresh_leaderboards(db)
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the process on startup and stop its background work on shutdown."""
+    # Size the threadpool that runs the sync route handlers
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW if settings.THREADPOOL_SIZE is None else settings.THREADPOOL_SIZE
+    )
+    # Single-process deployments only; see LEADERBOARD_REFRESH_SECONDS
+    refresher = None
+    if settings.LEADERBOARD_REFRESH_SECONDS > 0:
+        refresher = asyncio.create_task(run_periodically(settings.LEADERBOARD_REFRESH_SECONDS, refresh_leaderboards))
+    yield
+    if refresher is not None:
+        refresher.cancel()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="A GitHub clone API for portfolio project"
+    description="A GitHub clone API for portfolio project",
+    lifespan=lifespan
+)
+
+# Rate limit and admission control (added before CORS so rejections carry CORS headers)
+app.add_middleware(
+    rate_limit.RateLimitMiddleware,
+    limits=settings.RATE_LIMITS,
+    max_concurrent=(
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        if settings.MAX_CONCURRENT_REQUESTS is None else settings.MAX_CONCURRENT_REQUESTS
+    ),
+    prefix=settings.API_V1_PREFIX,
+    trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
 )
 
 # Configure CORS
@@ -29,8 +79,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, *VALIDATOR_HEADERS, OPEN_ISSUES_HEADER, CLOSED_ISSUES_HEADER,
+                    *rate_limit.RATE_LIMIT_HEADERS],
 )
 
+# Record per-route latency, response size and DB usage (added last so it wraps CORS too)
+app.add_middleware(metrics.MetricsMiddleware, server_timing=settings.METRICS_SERVER_TIMING)
+
 # Include routers
 app.include_router(user_routes.router, prefix=settings.API_V1_PREFIX, tags=["users"])
 app.include_router(repository_routes.router, prefix=settings.API_V1_PREFIX, tags=["repositories"])
@@ -38,6 +93,7 @@ app.include_router(commit_routes.router, prefix=settings.API_V1_PREFIX, tags=["c
 app.include_router(issue_routes.router, prefix=settings.API_V1_PREFIX, tags=["issues"])
 app.include_router(search_routes.router, prefix=settings.API_V1_PREFIX, tags=["search"])
 app.include_router(star_routes.router, prefix=settings.API_V1_PREFIX, tags=["stars"])
+app.include_router(activity_routes.router, prefix=settings.API_V1_PREFIX, tags=["activity"])
 
 
 @app.get("/")
@@ -53,4 +109,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "cache": cache.stats(), "rate_limit": rate_limit.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus metrics endpoint."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -4,5 +4,8 @@ from app.models.repository import Repository
 from app.models.commit import Commit
 from app.models.issue import Issue
 from app.models.star import Star
+from app.models.repository_stats import RepositoryDailyStats, RepositoryAuthorStats
+from app.models.leaderboard import LeaderboardEntry
+from app.models.activity import ActivityEvent, TimelineEntry
 
-__all__ = ["User", "Repository", "Commit", "Issue", "Star"]
+__all__ = ["User", "Repository", "Commit", "Issue", "Star", "RepositoryDailyStats", "RepositoryAuthorStats", "LeaderboardEntry", "ActivityEvent", "TimelineEntry"]
@@ -0,0 +1,59 @@
+"""Activity event and timeline models."""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class ActivityKind(enum.Enum):
+    """What an activity event records."""
+    COMMIT = "commit"
+    ISSUE = "issue"
+    STAR = "star"
+
+
+class ActivityEvent(Base):
+    """One user action on a repository, in the order it was recorded.
+
+    `subject_id` is the id of the commit, issue or star row the event was
+    recorded for; it is not a foreign key, so events outlive unstars.
+    """
+    
+    __tablename__ = "activity_events"
+    
+    id = Column(Integer, primary_key=True)
+    actor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
+    kind = Column(Enum(ActivityKind), nullable=False)
+    subject_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships (read through Projection joins only)
+    actor = relationship("User", viewonly=True)
+    repository = relationship("Repository", viewonly=True)
+    
+    __table_args__ = (
+        # A user's own activity and a repository's activity, newest first
+        Index("ix_activity_events_actor", "actor_id", "id"),
+        Index("ix_activity_events_repository", "repository_id", "id"),
+        # Finding the events just recorded for a batch of commits or stars
+        Index("ix_activity_events_subject", "kind", "subject_id"),
+    )
+
+
+class TimelineEntry(Base):
+    """An event delivered to a user's feed (fan-out on write).
+
+    Reading a feed is a range scan of this table's primary key.
+    """
+    
+    __tablename__ = "timeline_entries"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("activity_events.id"), primary_key=True)
+    
+    __table_args__ = (
+        # Removing an event from every feed it was delivered to
+        Index("ix_timeline_entries_event", "event_id"),
+    )
@@ -1,5 +1,6 @@
 """Commit model."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -11,12 +12,27 @@ class Commit(Base):
     __tablename__ = "commits"
     
     id = Column(Integer, primary_key=True, index=True)
-    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False, index=True)
+    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     message = Column(Text, nullable=False)
     hash = Column(String(40), unique=True, nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Stored at whole seconds (the content hash keeps the microseconds); on SQLite,
+    # in CURRENT_TIMESTAMP's format so explicit and defaulted values compare alike
+    created_at = Column(
+        DateTime(timezone=True).with_variant(
+            sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+            "sqlite"
+        ),
+        server_default=func.now()
+    )
     
     # Relationships
     repository = relationship("Repository", back_populates="commits")
     author = relationship("User", back_populates="commits")
+    
+    __table_args__ = (
+        # Repository history, newest first (listing, keyset cursors, list ETags)
+        Index("ix_commits_repository_created", "repository_id", "created_at", "id"),
+        # Commits by author (user deletion)
+        Index("ix_commits_author_id", "author_id"),
+    )
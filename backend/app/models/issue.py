@@ -1,5 +1,5 @@
 """Issue model."""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -18,7 +18,7 @@ class Issue(Base):
     __tablename__ = "issues"
     
     id = Column(Integer, primary_key=True, index=True)
-    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False, index=True)
+    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
@@ -29,3 +29,11 @@ class Issue(Base):
     # Relationships
     repository = relationship("Repository", back_populates="issues")
     creator = relationship("User", back_populates="issues", foreign_keys=[creator_id])
+    
+    __table_args__ = (
+        # Repository issue list, newest first, with and without a status filter
+        Index("ix_issues_repository_created", "repository_id", "created_at", "id"),
+        Index("ix_issues_repository_status_created", "repository_id", "status", "created_at", "id"),
+        # Issues by creator (user deletion)
+        Index("ix_issues_creator_id", "creator_id"),
+    )
@@ -0,0 +1,24 @@
+"""Leaderboard model."""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class LeaderboardEntry(Base):
+    """One ranked repository of a precomputed leaderboard.
+
+    Rebuilt in the background by trending_controller.refresh_leaderboards;
+    reading a leaderboard is a primary key range scan of at most K rows.
+    """
+    
+    __tablename__ = "leaderboard_entries"
+    
+    # "day", "week" or "all" (WINDOW and RANK are reserved words in MySQL 8)
+    period = Column(String(8), primary_key=True)
+    position = Column(Integer, primary_key=True)
+    # No foreign key: entries of a deleted repository drop out of reads
+    # through the join with repositories until the next refresh replaces them
+    repository_id = Column(Integer, nullable=False)
+    stars = Column(Integer, nullable=False)
+    commits = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
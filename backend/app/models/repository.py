@@ -1,7 +1,7 @@
 """Repository model."""
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, false as sa_false
 from app.database import Base
 
 
@@ -15,16 +15,40 @@ class Repository(Base):
     description = Column(Text, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_public = Column(Boolean, default=True, nullable=False)
+    # Denormalized star count, maintained by star_controller
+    stars_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Set once stars_count first exceeds FEED_FANOUT_MAX_STARS and never cleared:
+    # events are then merged into stargazers' feeds on read (activity_controller)
+    feed_fanout_on_read = Column(Boolean, default=False, server_default=sa_false(), nullable=False)
+    # Denormalized issue counts by status, maintained by issue_controller
+    open_issues_count = Column(Integer, default=0, server_default="0", nullable=False)
+    closed_issues_count = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped by every commit / issue write; the list endpoints' ETag and Last-Modified
+    commits_version = Column(Integer, default=0, server_default="0", nullable=False)
+    commits_updated_at = Column(DateTime(timezone=True), nullable=True)
+    issues_version = Column(Integer, default=0, server_default="0", nullable=False)
+    issues_updated_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    # Relationships
+    # Relationships. Deleting a repository removes its rows with set-based deletes
+    # (app/utils/bulk_delete.py); passive_deletes keeps the ORM from loading them.
     owner = relationship("User", back_populates="repositories")
-    commits = relationship("Commit", back_populates="repository", cascade="all, delete-orphan")
-    issues = relationship("Issue", back_populates="repository", cascade="all, delete-orphan")
-    stars = relationship("Star", back_populates="repository", cascade="all, delete-orphan")
+    commits = relationship("Commit", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True)
+    issues = relationship("Issue", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True)
+    stars = relationship("Star", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True)
     
-    # Composite unique constraint for owner + name
     __table_args__ = (
+        # Composite unique constraint for owner + name
+        UniqueConstraint("owner_id", "name", name="uq_repositories_owner_name"),
+        # Repository list, newest first, overall and per owner
+        Index("ix_repositories_created", "created_at", "id"),
+        Index("ix_repositories_owner_created", "owner_id", "created_at", "id"),
+        # All-time popularity ranking (leaderboard refresh)
+        Index("ix_repositories_public_stars", "is_public", "stars_count", "id"),
+        # Fan-out-on-read repositories, looked up on every feed read
+        Index("ix_repositories_feed_fanout_on_read", "feed_fanout_on_read", "id"),
+        # Full-text index backing repository search (MySQL only, see app.utils.search_index)
+        Index("ft_repositories_name_description", "name", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
         {"mysql_engine": "InnoDB"},
     )
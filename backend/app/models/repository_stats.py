@@ -0,0 +1,46 @@
+"""Repository statistics rollup models."""
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class RepositoryDailyStats(Base):
+    """Per-repository activity counters, one row per repository and UTC day.
+
+    Maintained incrementally by the write controllers (app/utils/rollups.py)
+    so rankings and statistics read a handful of buckets instead of
+    aggregating the commits and stars tables.
+    """
+    
+    __tablename__ = "repository_daily_stats"
+    
+    repository_id = Column(Integer, ForeignKey("repositories.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    # Net stars gained that day (stars minus unstars)
+    stars = Column(Integer, default=0, server_default="0", nullable=False)
+    commits = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    __table_args__ = (
+        # Window scans across all repositories (leaderboard refresh)
+        Index("ix_repository_daily_stats_day", "day", "repository_id"),
+    )
+
+
+class RepositoryAuthorStats(Base):
+    """Per-repository commit counts by author, for top-author rankings."""
+    
+    __tablename__ = "repository_author_stats"
+    
+    repository_id = Column(Integer, ForeignKey("repositories.id"), primary_key=True)
+    author_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    commits = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Relationships (read through Projection joins only)
+    author = relationship("User", viewonly=True)
+    
+    __table_args__ = (
+        # Top authors of a repository, most commits first
+        Index("ix_repository_author_stats_commits", "repository_id", "commits", "author_id"),
+        # Author rows by user (user deletion)
+        Index("ix_repository_author_stats_author", "author_id"),
+    )
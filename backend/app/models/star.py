@@ -1,5 +1,5 @@
 """Star model."""
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -22,4 +22,8 @@ class Star(Base):
     # Ensure a user can only star a repository once
     __table_args__ = (
         UniqueConstraint('user_id', 'repository_id', name='unique_user_repo_star'),
+        # A user's starred list, most recent first
+        Index('ix_stars_user_created', 'user_id', 'created_at', 'id'),
+        # Per-repository star lookups (counts, reconciliation)
+        Index('ix_stars_repository_id', 'repository_id'),
     )
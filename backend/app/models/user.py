@@ -1,5 +1,5 @@
 """User model."""
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -17,8 +17,16 @@ class User(Base):
     avatar_url = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
-    # Relationships
-    repositories = relationship("Repository", back_populates="owner", cascade="all, delete-orphan")
-    commits = relationship("Commit", back_populates="author", cascade="all, delete-orphan")
-    issues = relationship("Issue", back_populates="creator", foreign_keys="Issue.creator_id", cascade="all, delete-orphan")
-    stars = relationship("Star", back_populates="user", cascade="all, delete-orphan")
+    # Relationships. Deleting a user removes its rows with set-based deletes
+    # (app/utils/bulk_delete.py); passive_deletes keeps the ORM from loading them.
+    repositories = relationship("Repository", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    commits = relationship("Commit", back_populates="author", cascade="all, delete-orphan", passive_deletes=True)
+    issues = relationship("Issue", back_populates="creator", foreign_keys="Issue.creator_id", cascade="all, delete-orphan", passive_deletes=True)
+    stars = relationship("Star", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Full-text index backing user search (MySQL only, see app.utils.search_index)
+    __table_args__ = (
+        # User list, newest first
+        Index("ix_users_created", "created_at", "id"),
+        Index("ft_users_username_email", "username", "email", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
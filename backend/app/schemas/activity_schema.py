@@ -0,0 +1,34 @@
+"""Activity Pydantic schemas."""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.models.activity import ActivityKind
+from app.schemas.user_schema import UserResponse
+
+
+class RepositorySummary(BaseModel):
+    """The repository fields embedded in an activity event."""
+    id: int
+    name: str
+    owner_id: int
+    
+    class Config:
+        from_attributes = True
+
+
+class ActivityEventResponse(BaseModel):
+    """Schema for activity event response.
+
+    `subject_id` is the commit, issue or star id the event was recorded for.
+    """
+    id: int
+    kind: ActivityKind
+    actor_id: int
+    repository_id: int
+    subject_id: int
+    created_at: datetime
+    actor: Optional[UserResponse] = None
+    repository: Optional[RepositorySummary] = None
+    
+    class Config:
+        from_attributes = True
@@ -1,7 +1,7 @@
 """Commit Pydantic schemas."""
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from app.schemas.user_schema import UserResponse
 
 
@@ -27,3 +27,34 @@ class CommitResponse(CommitBase):
     
     class Config:
         from_attributes = True
+
+
+class CommitBatchItem(CommitBase):
+    """Schema for one commit in a batch push.
+
+    `created_at` lets imports keep original timestamps; it defaults to now.
+    `nonce` is hashed into the commit, for imports of commits that share
+    author, timestamp and message (for example their original hash).
+    """
+    author_id: int
+    created_at: Optional[datetime] = None
+    nonce: Optional[str] = None
+
+
+class CommitBatchResult(BaseModel):
+    """Outcome for one item of a batch push, in request order."""
+    index: int
+    status: str
+    id: Optional[int] = None
+    hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class CommitBatchResponse(BaseModel):
+    """Schema for a batch push response."""
+    created: int
+    duplicates: int = 0
+    failed: int
+    elapsed_seconds: float
+    commits_per_second: float
+    results: List[CommitBatchResult]
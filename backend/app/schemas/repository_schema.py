@@ -1,8 +1,10 @@
 """Repository Pydantic schemas."""
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from app.schemas.user_schema import UserResponse
+from app.schemas.commit_schema import CommitResponse
+from app.schemas.issue_schema import IssueResponse
 
 
 class RepositoryBase(BaseModel):
@@ -28,9 +30,74 @@ class RepositoryResponse(RepositoryBase):
     """Schema for repository response."""
     id: int
     owner_id: int
+    stars_count: int = 0
+    open_issues_count: int = 0
+    closed_issues_count: int = 0
     created_at: datetime
     updated_at: datetime
     owner: Optional[UserResponse] = None
     
     class Config:
         from_attributes = True
+
+
+class TrendingRepository(BaseModel):
+    """Schema for one entry of a trending leaderboard."""
+    rank: int
+    stars: int
+    commits: int
+    repository: RepositoryResponse
+
+
+class DailyCount(BaseModel):
+    """A count for one UTC day."""
+    day: date
+    count: int
+
+
+class WeeklyCount(BaseModel):
+    """A count for one week, keyed by its Monday."""
+    week: date
+    count: int
+
+
+class StarGrowth(BaseModel):
+    """Stars gained on one day (net of unstars) and the total at the end of it."""
+    day: date
+    stars: int
+    total: int
+
+
+class IssueCounts(BaseModel):
+    """Open and closed issue totals."""
+    open: int
+    closed: int
+
+
+class AuthorCommits(BaseModel):
+    """An author's number of commits to a repository."""
+    author_id: int
+    commits: int
+    author: Optional[UserResponse] = None
+
+
+class RepositoryStats(BaseModel):
+    """Schema for repository statistics over the last `days` days."""
+    repository_id: int
+    since: date
+    until: date
+    commits_per_day: List[DailyCount]
+    commits_per_week: List[WeeklyCount]
+    issues: IssueCounts
+    top_authors: List[AuthorCommits]
+    star_growth: List[StarGrowth]
+
+
+class RepositoryOverview(BaseModel):
+    """Schema for the repository page: the repository plus its latest activity."""
+    repository: RepositoryResponse
+    commits: List[CommitResponse]
+    commits_next_cursor: Optional[str] = None
+    issues: List[IssueResponse]
+    issues_next_cursor: Optional[str] = None
+    is_starred: Optional[bool] = None
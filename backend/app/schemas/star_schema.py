@@ -0,0 +1,23 @@
+"""Star Pydantic schemas."""
+from pydantic import BaseModel
+from typing import List
+
+
+class StarPair(BaseModel):
+    """One user/repository pair in a batch."""
+    user_id: int
+    repository_id: int
+
+
+class StarBatchRequest(BaseModel):
+    """Schema for a batch star/unstar request."""
+    star: List[StarPair] = []
+    unstar: List[StarPair] = []
+
+
+class StarBatchResponse(BaseModel):
+    """Schema for a batch star/unstar response."""
+    starred: int
+    unstarred: int
+    unchanged: int
+    not_found: List[StarPair]
@@ -0,0 +1,20 @@
+"""Periodic background jobs run inside the API process."""
+import asyncio
+import logging
+from typing import Callable
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(interval: float, job: Callable[[], object]) -> None:
+    """Run the blocking `job` in the threadpool every `interval` seconds until cancelled.
+
+    A failing run is logged and retried on the next tick.
+    """
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception:
+            logger.exception("Background job %s failed", getattr(job, "__name__", job))
+        await asyncio.sleep(interval)
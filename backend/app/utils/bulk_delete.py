@@ -0,0 +1,27 @@
+"""Set-based deletes for large child tables.
+
+Deleting a repository or user through the ORM cascade loads every commit,
+issue and star into the session first. delete_in_chunks() instead selects a
+chunk of primary keys through an index and deletes them with one statement,
+committing each chunk so no transaction holds locks for the whole purge.
+An interrupted purge leaves the parent in place; deleting it again resumes.
+"""
+from sqlalchemy.orm import Session
+
+# Rows deleted per statement/transaction
+DELETE_CHUNK_SIZE = 10000
+
+
+def delete_in_chunks(db: Session, model, *criteria, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+    """Delete every `model` row matching `criteria`, `chunk_size` rows per transaction.
+
+    Returns the number of rows deleted.
+    """
+    deleted = 0
+    while True:
+        ids = [row_id for row_id, in db.query(model.id).filter(*criteria).limit(chunk_size)]
+        if not ids:
+            return deleted
+        db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        deleted += len(ids)
@@ -0,0 +1,242 @@
+"""Read-through cache for single-entity GET responses.
+
+Values are JSON-ready response dicts keyed by entity, e.g. "user:42". Reads go
+through get_or_load(); controllers call invalidate() after committing a write
+that changes a cached entity. Entries are also tagged with the user and
+repository they embed or belong to, so a user edit or a repository delete
+drops exactly those entries with invalidate_tags(). The backend is chosen by
+settings.CACHE_BACKEND: "memory" (in-process LRU), "redis" (any
+Redis-protocol server) or "none".
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+from pydantic import BaseModel
+from app.config import settings
+
+
+class LRUCache:
+    """In-process LRU cache with a per-entry TTL and a bound on entry count."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # tag -> keys of the live entries carrying it, and the reverse
+        self._tagged: dict[str, set[str]] = {}
+        self._key_tags: dict[str, tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        with self._lock:
+            self._untag(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            tags = tuple(tags)
+            if tags:
+                self._key_tags[key] = tags
+                for tag in tags:
+                    self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._drop(key)
+
+    def delete_tags(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tagged.get(tag, ())):
+                    self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._untag(key)
+
+    def _untag(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+
+class RedisCache:
+    """Cache stored in a Redis-protocol server.
+
+    `client` is a redis-py compatible client (or a fake implementing get,
+    set with `ex`, delete, sadd, smembers, expire and pipeline),
+    shared by every worker process. Each tag is a set of the keys carrying
+    it, expiring with the newest of them.
+    """
+
+    def __init__(self, client, ttl: float, namespace: str = "cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.namespace = namespace
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.namespace + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.set(self.namespace + key, json.dumps(value), ex=int(self.ttl))
+        for tag in tags:
+            pipe.sadd(self.namespace + tag, self.namespace + key)
+            pipe.expire(self.namespace + tag, int(self.ttl))
+        pipe.execute()
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.namespace + key for key in keys))
+
+    def delete_tags(self, *tags: str) -> None:
+        for tag in tags:
+            keys = self.client.smembers(self.namespace + tag)
+            self.client.delete(*keys, self.namespace + tag)
+
+
+class NullCache:
+    """Cache that stores nothing; every read is a miss."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def delete_tags(self, *tags: str) -> None:
+        pass
+
+
+def create_backend():
+    """Build the cache backend selected in settings."""
+    if settings.CACHE_BACKEND == "redis":
+        import redis
+        return RedisCache(redis.Redis.from_url(settings.REDIS_URL), settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "none":
+        return NullCache()
+    return LRUCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+
+
+_backend = create_backend()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+# Route handlers run on a threadpool, and `+=` on a dict entry is not atomic
+_stats_lock = threading.Lock()
+
+
+def configure(backend) -> None:
+    """Replace the active cache backend (e.g. with a RedisCache over a fake client)."""
+    global _backend
+    _backend = backend
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def username_key(username: str) -> str:
+    return f"user:username:{username}"
+
+
+def repository_key(repo_id: int) -> str:
+    return f"repository:{repo_id}"
+
+
+def commit_key(commit_id: int) -> str:
+    return f"commit:{commit_id}"
+
+
+def issue_key(issue_id: int) -> str:
+    return f"issue:{issue_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"tag:user:{user_id}"
+
+
+def repository_tag(repo_id: int) -> str:
+    return f"tag:repository:{repo_id}"
+
+
+def repository_tags(body: dict) -> list[str]:
+    """Tags of a cached repository: its embedded owner."""
+    return [user_tag(body["owner_id"])]
+
+
+def commit_tags(body: dict) -> list[str]:
+    """Tags of a cached commit: its repository and embedded author."""
+    return [repository_tag(body["repository_id"]), user_tag(body["author_id"])]
+
+
+def issue_tags(body: dict) -> list[str]:
+    """Tags of a cached issue: its repository and embedded creator."""
+    return [repository_tag(body["repository_id"]), user_tag(body["creator_id"])]
+
+
+def get_or_load(
+    key: str, schema: type[BaseModel], load: Callable[[], Any], tags: Optional[Callable[[dict], list[str]]] = None
+) -> dict:
+    """Return the cached response for `key`, loading and caching it on a miss.
+
+    `load` returns the ORM object, which is serialized through `schema`;
+    `tags` maps the serialized body to the tags the entry is stored under.
+    Errors raised by `load` (such as a 404) are not cached.
+    """
+    value = _backend.get(key)
+    if value is not None:
+        _count("hits")
+        return value
+    _count("misses")
+    value = schema.model_validate(load()).model_dump(mode="json")
+    _backend.set(key, value, tags(value) if tags else ())
+    return value
+
+
+def invalidate(*keys: str) -> None:
+    """Drop cached entries. Call after the write has been committed."""
+    _count("invalidations", len(keys))
+    _backend.delete(*keys)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Drop every cached entry stored under any of `tags`. Call after the write has been committed."""
+    _count("invalidations", len(tags))
+    _backend.delete_tags(*tags)
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def stats() -> dict:
+    """Hit/miss counters for this process."""
+    with _stats_lock:
+        counters = dict(_stats)
+    lookups = counters["hits"] + counters["misses"]
+    return {
+        **counters,
+        "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+        "backend": type(_backend).__name__,
+    }
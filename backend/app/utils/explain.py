@@ -0,0 +1,81 @@
+"""Index advisor: EXPLAIN every SELECT and flag plans that scan or sort.
+
+Enable with the DB_EXPLAIN_CHECK setting in development and test runs. Each
+SELECT issued through the engine is EXPLAINed on the same connection; full
+table scans and sorts that could not use an index are logged as warnings
+and collected in `findings` so a test run can assert none were introduced.
+"""
+import logging
+from dataclasses import dataclass
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Finding:
+    """A problem spotted in one statement's query plan."""
+    statement: str
+    problem: str
+
+
+findings: list[Finding] = []
+
+
+def _mysql_problems(rows) -> list[str]:
+    problems = []
+    for plan in rows:
+        table = plan.get("table")
+        extra = plan.get("Extra") or ""
+        if plan.get("type") == "ALL":
+            problems.append(f"full table scan on {table}")
+        if "Using filesort" in extra:
+            problems.append(f"filesort on {table}")
+        if "Using temporary" in extra:
+            problems.append(f"temporary table for {table}")
+    return problems
+
+
+def _sqlite_problems(rows) -> list[str]:
+    problems = []
+    for row in rows:
+        detail = row[-1]
+        # Scans of the schema catalog, FTS virtual tables and row-value IN
+        # lists (VALUES) are not table scans
+        if detail.startswith("SCAN sqlite_master") or "VIRTUAL TABLE" in detail or detail.endswith("CONSTANT ROWS"):
+            continue
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            problems.append(f"full table scan: {detail}")
+        elif detail.startswith("USE TEMP B-TREE"):
+            problems.append(f"sort without index: {detail}")
+    return problems
+
+
+def explain_problems(dbapi_connection, dialect_name: str, statement: str, parameters) -> list[str]:
+    """EXPLAIN `statement` on a raw DBAPI connection and describe any bad plan steps."""
+    cursor = dbapi_connection.cursor()
+    try:
+        if dialect_name == "mysql":
+            cursor.execute("EXPLAIN " + statement, parameters)
+            columns = [col[0] for col in cursor.description]
+            return _mysql_problems(dict(zip(columns, row)) for row in cursor.fetchall())
+        if dialect_name == "sqlite":
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+            return _sqlite_problems(cursor.fetchall())
+        return []
+    finally:
+        cursor.close()
+
+
+def install_explain_checker(engine: Engine) -> None:
+    """EXPLAIN every SELECT run on `engine` and record problematic plans."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _check_plan(conn, cursor, statement, parameters, context, executemany):
+        if executemany or not statement.lstrip().upper().startswith("SELECT"):
+            return
+        # Use the raw connection so the EXPLAIN itself bypasses engine events
+        problems = explain_problems(conn.connection.dbapi_connection, conn.dialect.name, statement, parameters)
+        for problem in problems:
+            findings.append(Finding(statement, problem))
+            logger.warning("Query plan: %s\n%s", problem, statement)
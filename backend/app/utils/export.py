@@ -0,0 +1,94 @@
+"""Streaming NDJSON / CSV exports.
+
+Rows come from a server-side cursor (Projection.stream) and are encoded,
+buffered and optionally gzipped as they arrive, so an export holds one batch
+of rows in memory however long the history is. The generator opens its own
+read session: the response body is produced after the route has returned.
+"""
+import csv
+import io
+import zlib
+from enum import Enum
+from typing import Callable, Iterable, Iterator
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import ReadSessionLocal
+from app.utils import serialization
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Encoded bytes gathered before a chunk is sent
+CHUNK_BYTES = 64 * 1024
+
+
+def _ndjson(fields: list[str], items: Iterable[dict]) -> Iterator[bytes]:
+    for item in items:
+        yield serialization.dumps(item) + b"\n"
+
+
+def _csv_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _csv(fields: list[str], items: Iterable[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for item in items:
+        writer.writerow([_csv_value(item[field]) for field in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _chunked(pieces: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) >= CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    request: Request,
+    fields: list[str],
+    load: Callable[[Session], Iterable[dict]],
+    fmt: str,
+    filename: str
+) -> StreamingResponse:
+    """Stream the dicts produced by `load(session)` as NDJSON or CSV.
+
+    The body is gzipped on the fly when the client accepts it.
+    """
+    encode = _csv if fmt == "csv" else _ndjson
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+
+    def body() -> Iterator[bytes]:
+        db = ReadSessionLocal()
+        try:
+            chunks = _chunked(encode(fields, load(db)))
+            yield from _gzipped(chunks) if compress else chunks
+        finally:
+            db.close()
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body(), media_type=EXPORT_FORMATS[fmt], headers=headers)
@@ -1,12 +1,43 @@
 """Utility helper functions."""
-from datetime import datetime
+import calendar
+import hashlib
+import secrets
+from datetime import datetime, timezone
 from typing import Optional
 
 
-def generate_commit_hash() -> str:
-    """Generate a random commit hash (simplified version)."""
-    import secrets
-    return secrets.token_hex(20)
+def commit_timestamp(value: Optional[datetime] = None) -> datetime:
+    """Naive UTC commit timestamp, keeping microseconds for the commit hash."""
+    if value is None:
+        value = datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def commit_nonce() -> str:
+    """Random nonce hashed into commits that are not imports, so no two of them can collide."""
+    return secrets.token_hex(16)
+
+
+def commit_hash(
+    repository_id: int, parent_hash: Optional[str], author_id: int, created_at: datetime, message: str,
+    nonce: Optional[str] = None
+) -> str:
+    """Content-addressed commit hash: SHA-1 over parent, author, timestamp, message and nonce, as in git.
+
+    The timestamp is hashed to the microsecond. Without a nonce the same
+    content on the same parent always hashes the same, so for imports the
+    unique index on `commits.hash` doubles as duplicate detection.
+    """
+    payload = (
+        f"repository {repository_id}\n"
+        f"parent {parent_hash or ''}\n"
+        f"author {author_id} {calendar.timegm(created_at.timetuple())}.{created_at.microsecond:06d}\n"
+        f"nonce {nonce or ''}\n"
+        f"\n{message}"
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
 
 
 def format_datetime(dt: Optional[datetime]) -> Optional[str]:
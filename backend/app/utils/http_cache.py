@@ -0,0 +1,71 @@
+"""HTTP conditional request helpers (ETag / Last-Modified)."""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+
+VALIDATOR_HEADERS = ["ETag", "Last-Modified"]
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from JSON-serializable version parts."""
+    digest = hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Database timestamps come back naive; they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison: the W/ prefix is ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """Attach validators to `response` and answer 304 if the client is current.
+
+    Returns a 304 Response when If-None-Match (or, without it,
+    If-Modified-Since) shows the client already has this version; the route
+    should return it as-is. Otherwise returns None and the route continues.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        last_modified = _as_utc(last_modified)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    elif last_modified is not None and "if-modified-since" in request.headers:
+        try:
+            since = _as_utc(parsedate_to_datetime(request.headers["if-modified-since"]))
+        except (TypeError, ValueError):
+            return None
+        fresh = last_modified.replace(microsecond=0) <= since
+    else:
+        fresh = False
+    return Response(status_code=304, headers=headers) if fresh else None
+
+
+def cached_response(request: Request, response: Response, body: dict, modified_field: Optional[str] = None):
+    """Conditional handling for a single resource served from the response cache.
+
+    The ETag is derived from the (possibly cached) body, so a cache hit that
+    matches the client's copy touches neither the database nor the serializer.
+    """
+    last_modified = datetime.fromisoformat(body[modified_field]) if modified_field and body.get(modified_field) else None
+    not_modified = conditional_response(request, response, make_etag(body), last_modified)
+    return not_modified or body
@@ -0,0 +1,49 @@
+"""Turning constraint violations into precise HTTP errors.
+
+Write controllers insert first and let foreign keys and unique indexes
+reject bad rows, instead of SELECTing every referenced row beforehand.
+Only when an insert fails do they look up, in one query, which reference
+was missing.
+"""
+from typing import NoReturn, Optional
+from fastapi import HTTPException
+from sqlalchemy import UniqueConstraint, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def missing_reference(db: Session, references: list[tuple]) -> Optional[str]:
+    """Return the detail of the first (model, id, detail) reference whose row does not exist.
+
+    All references are checked with a single query.
+    """
+    checks = [select(model.id).where(model.id == ref_id).exists() for model, ref_id, _ in references]
+    found = db.query(*checks).one()
+    for exists, (_, _, detail) in zip(found, references):
+        if not exists:
+            return detail
+    return None
+
+
+def raise_for_integrity_error(db: Session, references: list[tuple], detail: str) -> NoReturn:
+    """After rolling back an IntegrityError: 404 for a missing reference, otherwise 400 `detail`."""
+    not_found = missing_reference(db, references)
+    if not_found:
+        raise HTTPException(status_code=404, detail=not_found)
+    raise HTTPException(status_code=400, detail=detail)
+
+
+def unique_violation(error: IntegrityError, model, name: str) -> bool:
+    """Whether `error` was raised by the unique constraint `name` of `model`.
+
+    MySQL and PostgreSQL name the constraint in their message; SQLite lists
+    its columns instead ("UNIQUE constraint failed: table.col, ...").
+    """
+    message = str(error.orig)
+    if name in message:
+        return True
+    constraint = next(
+        c for c in model.__table__.constraints if isinstance(c, UniqueConstraint) and c.name == name
+    )
+    columns = ", ".join(f"{model.__tablename__}.{column.name}" for column in constraint.columns)
+    return f"UNIQUE constraint failed: {columns}" in message
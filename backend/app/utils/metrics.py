@@ -0,0 +1,179 @@
+"""Request performance metrics exposed in Prometheus text format.
+
+MetricsMiddleware times every HTTP request and, through a per-request
+RequestStats held in a context variable, attributes database work to it:
+SQLAlchemy engine events count queries and their time, and the connection
+pool reports how long checkout waited. Aggregates are served at /metrics.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import Engine, event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+@dataclass
+class RequestStats:
+    """Database work attributed to the current request."""
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels."""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                base = ",".join(f'{name}="{value}"' for name, value in zip(self.labelnames, labels))
+                prefix = base + "," if base else ""
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+                suffix = f"{{{base}}}" if base else ""
+                lines.append(f"{self.name}_sum{suffix} {total}")
+                lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", LATENCY_BUCKETS, ("method", "route", "status")
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size.", SIZE_BUCKETS, ("method", "route")
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries issued per request.", COUNT_BUCKETS, ("method", "route")
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Time spent in database queries per request.", LATENCY_BUCKETS, ("method", "route")
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Latency of individual database queries.", LATENCY_BUCKETS
+)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the pool.", LATENCY_BUCKETS
+)
+HISTOGRAMS = [REQUEST_LATENCY, RESPONSE_SIZE, REQUEST_DB_QUERIES, REQUEST_DB_TIME, DB_QUERY_LATENCY, POOL_WAIT]
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record query counts and timings for every statement run on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_LATENCY.observe(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+
+def record_pool_wait(seconds: float) -> None:
+    """Record a connection pool checkout wait."""
+    POOL_WAIT.observe(seconds)
+    stats = _current.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    from app.utils import cache, rate_limit
+
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    cache_stats = cache.stats()
+    for name in ("hits", "misses", "invalidations"):
+        lines.append(f"# TYPE cache_{name}_total counter")
+        lines.append(f'cache_{name}_total{{backend="{cache_stats["backend"]}"}} {cache_stats[name]}')
+    for name, count in rate_limit.stats().items():
+        lines.append(f"# TYPE rate_limit_{name}_total counter")
+        lines.append(f"rate_limit_{name}_total {count}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, response size and DB usage.
+
+    With `server_timing` enabled, each response also carries a Server-Timing
+    header breaking its latency down into pool wait, database and total time.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = {"status": 500, "size": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                if self.server_timing:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'pool;dur={stats.pool_wait_seconds * 1000:.2f}, '
+                        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_queries} queries", '
+                        f'app;dur={total_ms:.2f}'
+                    )
+                    message.setdefault("headers", []).append((b"server-timing", timing.encode()))
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            # FastAPI records the matched route in the scope; use its template
+            # rather than the raw path to keep label cardinality bounded
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUEST_LATENCY.observe(time.perf_counter() - started, method, path, str(response["status"]))
+            RESPONSE_SIZE.observe(response["size"], method, path)
+            REQUEST_DB_QUERIES.observe(stats.db_queries, method, path)
+            REQUEST_DB_TIME.observe(stats.db_seconds, method, path)
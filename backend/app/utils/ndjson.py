@@ -0,0 +1,52 @@
+"""Incremental NDJSON request bodies for sync routes.
+
+A plain `def` route runs in a worker thread, where Request.stream() cannot be
+iterated directly. read_body pulls the body chunk by chunk from the event
+loop through anyio.from_thread, and iter_items splits it into lines and
+decodes them as they arrive, so a route holds one chunk and one line in
+memory however large the upload is.
+"""
+import json
+from typing import Any, AsyncIterator, Iterable, Iterator, NamedTuple, Optional
+import anyio.from_thread
+from fastapi import Request
+
+
+class MalformedLine(NamedTuple):
+    """Stands in for a line that is not valid JSON, so it can be reported per item."""
+    error: str
+
+
+async def _next_chunk(stream: AsyncIterator[bytes]) -> Optional[bytes]:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+def read_body(request: Request) -> Iterator[bytes]:
+    """Yield the request body chunk by chunk. Call from a sync route's worker thread."""
+    stream = request.stream()
+    while (chunk := anyio.from_thread.run(_next_chunk, stream)) is not None:
+        if chunk:
+            yield chunk
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split a chunked body into its non-blank lines."""
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        yield from (line for line in lines if line.strip())
+    if pending.strip():
+        yield pending
+
+
+def iter_items(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decode one JSON value per line; lines that do not decode yield a MalformedLine."""
+    for line in iter_lines(chunks):
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield MalformedLine(f"Malformed JSON: {exc}")
@@ -0,0 +1,108 @@
+"""Keyset (cursor) pagination helpers."""
+import base64
+import json
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+from fastapi import HTTPException, Response
+from sqlalchemy import String, and_, literal, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page(NamedTuple):
+    """A page of results plus the cursor for the following page."""
+    items: list
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque cursor string."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_id_cursor(row_id: int) -> str:
+    """Encode an id-only position, for append-only logs ordered by id."""
+    return base64.urlsafe_b64encode(json.dumps([row_id]).encode()).decode().rstrip("=")
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_id_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        row_id, = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _comparable_datetime(query, value: datetime):
+    """Bind a timestamp so it compares equal to the stored column value."""
+    # Stored timestamps are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    # SQLite keeps CURRENT_TIMESTAMP defaults as 'YYYY-MM-DD HH:MM:SS' text, while
+    # SQLAlchemy renders bound datetimes with a '.000000' suffix; compare against
+    # the same textual form so equal timestamps are recognised as equal.
+    if query.session.get_bind().dialect.name == "sqlite" and not value.microsecond:
+        return literal(value.strftime("%Y-%m-%d %H:%M:%S"), String)
+    return value
+
+
+def paginate(query, created_col, id_col, cursor: Optional[str] = None, skip: int = 0, limit: int = 100) -> Page:
+    """Fetch one page of `query` ordered by (created_at, id) descending.
+
+    With a cursor the page starts strictly after the encoded position, so the
+    database seeks straight to it through the index instead of scanning and
+    discarding earlier rows. `skip` is only honoured when no cursor is given
+    (legacy offset mode). Items are ORM objects for an entity query and row
+    tuples for a column query (see serialization.Projection).
+    """
+    width = len(query.column_descriptions)
+    query = query.order_by(created_col.desc(), id_col.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        created_at = _comparable_datetime(query, created_at)
+        # The redundant `<=` gives the planner an index range to seek to;
+        # the OR alone is applied as a filter while scanning from the top
+        query = query.filter(created_col <= created_at, or_(
+            created_col < created_at,
+            and_(created_col == created_at, id_col < row_id)
+        ))
+    elif skip:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.add_columns(created_col, id_col).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+    items = [row[0] for row in rows] if width == 1 else [tuple(row[:width]) for row in rows]
+    return Page(items, next_cursor)
+
+
+def created_between(query, created_col, since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Restrict `query` to rows created in [since, until)."""
+    if since is not None:
+        query = query.filter(created_col >= _comparable_datetime(query, since))
+    if until is not None:
+        query = query.filter(created_col < _comparable_datetime(query, until))
+    return query
+
+
+def page_response(response: Response, page: Page) -> list:
+    """Expose the page's next cursor as a header and return its items."""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
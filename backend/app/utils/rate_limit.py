@@ -0,0 +1,276 @@
+"""Per-client rate limiting and admission control for the API.
+
+RateLimitMiddleware sorts each API request into a route class ("search",
+"export", "write" or "read") and takes a token from the client's bucket
+for that class. An empty bucket answers 429 with Retry-After; every
+response carries X-RateLimit-Limit / -Remaining / -Reset. It also caps
+the requests in flight per process below what the database connection
+pool can serve, answering 503 instead of letting requests queue on pool
+checkout until they time out.
+
+Buckets live in a backend chosen by settings.RATE_LIMIT_BACKEND: "memory"
+(per process), "redis" (shared by every worker, one atomic script call
+per request) or "none".
+"""
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LIMIT_HEADER = "X-RateLimit-Limit"
+REMAINING_HEADER = "X-RateLimit-Remaining"
+RESET_HEADER = "X-RateLimit-Reset"
+RATE_LIMIT_HEADERS = [LIMIT_HEADER, REMAINING_HEADER, RESET_HEADER, "Retry-After"]
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class Decision(NamedTuple):
+    """Outcome of taking a token: whether the request may proceed and the bucket's state after it."""
+    allowed: bool
+    remaining: int
+    # Seconds until a token is available (0 when allowed) and until the bucket is full again
+    retry_after: float
+    reset_after: float
+
+
+def take_token(tokens: float, elapsed: float, rate: float, burst: int) -> tuple[bool, float]:
+    """Refill a bucket holding `tokens` for `elapsed` seconds, then take one token if there is one.
+
+    Returns (allowed, tokens left). Shared by the in-process backend and the
+    local stand-in for the shared store, so both behave like the Redis script.
+    """
+    tokens = min(burst, tokens + max(elapsed, 0.0) * rate)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+def decide(allowed: bool, tokens: float, rate: float, burst: int) -> Decision:
+    """Build the Decision reported for a bucket left with `tokens`."""
+    return Decision(
+        allowed,
+        int(tokens),
+        0.0 if allowed else (1 - tokens) / rate,
+        (burst - tokens) / rate,
+    )
+
+
+class MemoryBuckets:
+    """Token buckets in this process, bounded to `max_entries` clients (least recently seen evicted)."""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._buckets.get(key, (burst, now))
+            allowed, tokens = take_token(tokens, now - stamp, rate, burst)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        return decide(allowed, tokens, rate, burst)
+
+
+# Refill and take in one atomic step on the server, timed by the server's
+# clock so every worker agrees. Tokens are returned as a string because
+# Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(state[1]) or burst
+local stamp = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - stamp) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'stamp', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class SharedBuckets:
+    """Token buckets in a Redis-protocol store shared by every worker process.
+
+    `client` is a redis.asyncio compatible client, or any object with an
+    async `eval(script, numkeys, *keys_and_args)` that runs
+    TOKEN_BUCKET_SCRIPT, such as LocalStore. If the store cannot be reached
+    the request is let through: rate limiting fails open.
+    """
+
+    def __init__(self, client, namespace: str = "ratelimit:"):
+        self.client = client
+        self.namespace = namespace
+
+    async def take(self, key: str, rate: float, burst: int) -> Decision:
+        try:
+            allowed, tokens = await self.client.eval(TOKEN_BUCKET_SCRIPT, 1, self.namespace + key, rate, burst)
+        except Exception:
+            logger.warning("Rate limit store unavailable; letting request through", exc_info=True)
+            return Decision(True, burst, 0.0, 0.0)
+        return decide(bool(allowed), float(tokens), rate, burst)
+
+
+class LocalStore:
+    """In-process stand-in for the shared store, for development and tests.
+
+    Implements `eval` for TOKEN_BUCKET_SCRIPT only, with the same arguments
+    and results as Redis, so SharedBuckets runs unchanged without a server.
+    """
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    async def eval(self, script: str, numkeys: int, key: str, rate: float, burst: int) -> list:
+        if script != TOKEN_BUCKET_SCRIPT:
+            raise NotImplementedError("LocalStore only runs TOKEN_BUCKET_SCRIPT")
+        now = time.time()
+        with self._lock:
+            tokens, stamp = self._buckets.get(key, (burst, now))
+            allowed, tokens = take_token(tokens, now - stamp, rate, burst)
+            self._buckets[key] = (tokens, now)
+        return [int(allowed), repr(tokens)]
+
+
+class NoBuckets:
+    """Backend that never limits."""
+
+    async def take(self, key: str, rate: float, burst: int) -> Decision:
+        return Decision(True, burst, 0.0, 0.0)
+
+
+def create_backend():
+    """Build the rate limit backend selected in settings."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio
+        return SharedBuckets(redis.asyncio.Redis.from_url(settings.REDIS_URL))
+    if settings.RATE_LIMIT_BACKEND == "none":
+        return NoBuckets()
+    return MemoryBuckets()
+
+
+_backend = create_backend()
+_stats = {"limited": 0, "shed": 0}
+
+
+def configure(backend) -> None:
+    """Replace the active backend (e.g. with SharedBuckets over a LocalStore)."""
+    global _backend
+    _backend = backend
+
+
+def stats() -> dict:
+    """Requests rejected so far by the rate limiter (429) and the concurrency limiter (503)."""
+    return dict(_stats)
+
+
+def route_class(method: str, path: str, search_prefix: str) -> str:
+    """The limit class of a request, from its method and path alone (before routing)."""
+    if path.startswith(search_prefix):
+        return "search"
+    if path.endswith("/export"):
+        return "export"
+    if method not in READ_METHODS:
+        return "write"
+    return "read"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-client token buckets and a cap on requests in flight.
+
+    Only paths under `prefix` are limited. `limits` maps each route class to
+    (requests per second, burst). `max_concurrent` of 0 disables the
+    concurrency cap. Clients are identified by their socket address, or
+    with `trust_forwarded` by the first X-Forwarded-For address (only
+    behind a proxy that sets it).
+    """
+
+    def __init__(
+        self,
+        app,
+        limits: dict,
+        max_concurrent: int = 0,
+        prefix: str = "/api/v1",
+        trust_forwarded: bool = False,
+    ):
+        self.app = app
+        self.limits = {name: (float(rate), int(burst)) for name, (rate, burst) in limits.items()}
+        self.max_concurrent = max_concurrent
+        self.prefix = prefix
+        self.search_prefix = prefix + "/search"
+        self.trust_forwarded = trust_forwarded
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        # Shed before taking a token, so rejected requests cost the client nothing
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            _stats["shed"] += 1
+            await _reject(send, 503, "Server busy, retry shortly", [(b"retry-after", b"1")])
+            return
+
+        name = route_class(scope["method"], scope["path"], self.search_prefix)
+        limit = self.limits.get(name)
+        headers = []
+        if limit is not None:
+            rate, burst = limit
+            decision = await _backend.take(f"{name}:{self._client(scope)}", rate, burst)
+            headers = [
+                (b"x-ratelimit-limit", str(burst).encode()),
+                (b"x-ratelimit-remaining", str(decision.remaining).encode()),
+                (b"x-ratelimit-reset", str(math.ceil(decision.reset_after)).encode()),
+            ]
+            if not decision.allowed:
+                _stats["limited"] += 1
+                headers.append((b"retry-after", str(math.ceil(decision.retry_after)).encode()))
+                await _reject(send, 429, "Rate limit exceeded", headers)
+                return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and headers:
+                message.setdefault("headers", []).extend(headers)
+            await send(message)
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight -= 1
+
+    def _client(self, scope) -> str:
+        if self.trust_forwarded:
+            for header, value in scope["headers"]:
+                if header == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+
+async def _reject(send, status: int, detail: str, headers: list) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
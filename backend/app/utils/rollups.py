@@ -0,0 +1,49 @@
+"""Incremental daily rollups of repository activity.
+
+Write controllers call these inside their own transaction, so a bucket is
+only bumped when the commit or star it counts is actually written. Each
+call is one INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE per table that
+adds to the counters atomically.
+"""
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Iterable, Mapping
+from sqlalchemy.orm import Session
+from app.models.repository_stats import RepositoryAuthorStats, RepositoryDailyStats
+from app.utils.upsert import upsert_add
+
+STATS_KEY = ["repository_id", "day"]
+AUTHOR_STATS_KEY = ["repository_id", "author_id"]
+
+
+def utc_today() -> date:
+    """The current UTC day; buckets are kept in UTC like every stored timestamp."""
+    return datetime.now(timezone.utc).date()
+
+
+def add_repository_stats(db: Session, column: str, deltas: Mapping[tuple[int, date], int]) -> None:
+    """Add `deltas[(repository_id, day)]` to the `column` counter of each bucket."""
+    rows = [
+        {"repository_id": repository_id, "day": day, column: delta}
+        for (repository_id, day), delta in deltas.items() if delta
+    ]
+    if rows:
+        upsert_add(db, RepositoryDailyStats, rows, STATS_KEY)
+
+
+def record_stars(db: Session, deltas: Mapping[int, int]) -> None:
+    """Record net star changes per repository on today's buckets."""
+    today = utc_today()
+    add_repository_stats(db, "stars", {(repository_id, today): delta for repository_id, delta in deltas.items()})
+
+
+def record_commits(db: Session, commits: Iterable[tuple[int, int, datetime]]) -> None:
+    """Count `(repository_id, author_id, created_at)` commits on their creation day and author."""
+    commits = list(commits)
+    add_repository_stats(db, "commits", Counter((repository_id, created_at.date()) for repository_id, _, created_at in commits))
+    authors = Counter((repository_id, author_id) for repository_id, author_id, _ in commits)
+    if authors:
+        upsert_add(db, RepositoryAuthorStats, [
+            {"repository_id": repository_id, "author_id": author_id, "commits": count}
+            for (repository_id, author_id), count in authors.items()
+        ], AUTHOR_STATS_KEY)
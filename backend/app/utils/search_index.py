@@ -0,0 +1,167 @@
+"""Full-text search index for users and repositories.
+
+MySQL answers searches from native FULLTEXT indexes that InnoDB maintains on
+its own. SQLite answers them from an FTS5 table (`search_index`) that the
+create/update/delete controllers keep in sync inside their own transactions.
+Any other backend falls back to substring matching.
+
+Both kinds of index are created by migration 002_search_fulltext. Local
+SQLite databases built with create_all() get the FTS5 table from the
+metadata hook below; a SQLite without FTS5 fails there rather than
+silently searching without an index.
+"""
+import re
+from typing import Optional
+from sqlalchemy import Float, Integer, event, or_, func, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session, joinedload
+from app.config import settings
+from app.database import Base
+from app.models.user import User
+from app.models.repository import Repository
+
+# InnoDB's default parser keeps underscores inside words, FTS5's unicode61
+# tokenizer splits on them; tokenize queries the same way each index does.
+MYSQL_TOKEN_RE = re.compile(r"\w+")
+FTS5_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Searchable columns per indexed model
+INDEXED_COLUMNS = {
+    "user": (User, ("username", "email")),
+    "repository": (Repository, ("name", "description")),
+}
+
+# InnoDB's default full-text stopword list (INFORMATION_SCHEMA.INNODB_FT_DEFAULT_STOPWORD).
+# A required (+) stopword term matches nothing, so such words are dropped from queries.
+INNODB_STOPWORDS = frozenset({
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und", "www",
+})
+
+
+def tokenize(value: str, pattern: re.Pattern = FTS5_TOKEN_RE) -> list[str]:
+    """Split a search string into lowercase tokens."""
+    return pattern.findall(value.lower())
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_fts5_table(target, connection, **kw) -> None:
+    """Create and backfill the FTS5 table when create_all() builds a SQLite schema.
+
+    Mirrors migration 002_search_fulltext for databases that are not migrated.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    )).first()
+    if exists:
+        return
+    connection.execute(text(
+        "CREATE VIRTUAL TABLE search_index USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, body, prefix='2 3')"
+    ))
+    for kind, (model, columns) in INDEXED_COLUMNS.items():
+        body = " || ' ' || ".join(f"coalesce({col}, '')" for col in columns)
+        connection.execute(text(
+            f"INSERT INTO search_index (kind, ref_id, body) "
+            f"SELECT '{kind}', id, {body} FROM {model.__tablename__}"
+        ))
+
+
+def _uses_fts5(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def mysql_boolean_query(query: str) -> Optional[str]:
+    """Build an InnoDB boolean-mode query requiring every word of `query` as a prefix.
+
+    Tokens are runs of word characters, so boolean operators (+ - < > ( ) ~ * " @)
+    in the input never reach MATCH. Stopwords and words shorter than
+    SEARCH_MIN_TOKEN_SIZE are dropped: InnoDB does not index them, and a
+    required term for one would make the whole search match nothing.
+    Returns None when no searchable word is left.
+    """
+    tokens = [
+        tok for tok in tokenize(query, MYSQL_TOKEN_RE)
+        if len(tok) >= settings.SEARCH_MIN_TOKEN_SIZE and tok not in INNODB_STOPWORDS
+    ]
+    if not tokens:
+        return None
+    return " ".join(f"+{tok}*" for tok in tokens)
+
+
+def _index(db: Session, kind: str, obj) -> None:
+    if not _uses_fts5(db):
+        return
+    _, columns = INDEXED_COLUMNS[kind]
+    body = " ".join(getattr(obj, col) or "" for col in columns)
+    _remove(db, kind, [obj.id])
+    db.execute(
+        text("INSERT INTO search_index (kind, ref_id, body) VALUES (:kind, :ref_id, :body)"),
+        {"kind": kind, "ref_id": obj.id, "body": body}
+    )
+
+
+def _remove(db: Session, kind: str, ids: list[int]) -> None:
+    if not ids or not _uses_fts5(db):
+        return
+    db.execute(
+        text("DELETE FROM search_index WHERE kind = :kind AND ref_id = :ref_id"),
+        [{"kind": kind, "ref_id": ref_id} for ref_id in ids]
+    )
+
+
+def index_user(db: Session, user: User) -> None:
+    """Add or refresh a user's index entry. Call before committing."""
+    _index(db, "user", user)
+
+
+def index_repository(db: Session, repo: Repository) -> None:
+    """Add or refresh a repository's index entry. Call before committing."""
+    _index(db, "repository", repo)
+
+
+def remove_users(db: Session, user_ids: list[int]) -> None:
+    """Drop users from the index. Call before committing."""
+    _remove(db, "user", user_ids)
+
+
+def remove_repositories(db: Session, repo_ids: list[int]) -> None:
+    """Drop repositories from the index. Call before committing."""
+    _remove(db, "repository", repo_ids)
+
+
+def search(db: Session, kind: str, query: str, skip: int = 0, limit: int = 20) -> list:
+    """Return indexed objects matching every token of `query`, best match first.
+
+    Every token is matched as a word prefix so partial input works for type-ahead.
+    """
+    model, columns = INDEXED_COLUMNS[kind]
+    cols = [getattr(model, col) for col in columns]
+    options = [joinedload(Repository.owner)] if model is Repository else []
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        against = mysql_boolean_query(query)
+        if against is None:
+            return []
+        score = match(*cols, against=against).in_boolean_mode()
+        ranked = db.query(model).options(*options).filter(score > 0).order_by(score.desc(), model.id)
+    elif _uses_fts5(db):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        hits = text(
+            "SELECT ref_id, bm25(search_index) AS rank FROM search_index "
+            "WHERE search_index MATCH :match AND kind = :kind"
+        ).bindparams(
+            match=" ".join(f'"{tok}"*' for tok in tokens), kind=kind
+        ).columns(ref_id=Integer, rank=Float).subquery()
+        ranked = db.query(model).options(*options).join(hits, hits.c.ref_id == model.id).order_by(hits.c.rank, model.id)
+    else:
+        search_term = f"%{query.lower()}%"
+        ranked = db.query(model).options(*options).filter(or_(*(func.lower(col).like(search_term) for col in cols)))
+
+    return ranked.offset(skip).limit(limit).all()
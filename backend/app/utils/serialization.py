@@ -0,0 +1,164 @@
+"""Fast-path JSON output for list endpoints.
+
+List routes keep their Pydantic `response_model` for the OpenAPI schema, but
+validating one model per row (plus a nested UserResponse re-checking every
+EmailStr) costs far more than the query for a page of 100. A Projection
+selects exactly the columns a response schema needs as plain row tuples, and
+render() encodes the resulting dicts straight to JSON bytes, skipping
+response_model validation. orjson is used when installed.
+
+Projection.narrow() applies the `fields` / `expand` query parameters, so a
+sparse request reads fewer columns and sends a smaller payload.
+"""
+import json
+import typing
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterator, Optional
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, aliased
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _nested_schema(annotation) -> type[BaseModel]:
+    # Optional[UserResponse] -> UserResponse
+    for arg in typing.get_args(annotation) or (annotation,):
+        if isinstance(arg, type) and issubclass(arg, BaseModel):
+            return arg
+    raise TypeError(f"{annotation!r} is not a response schema")
+
+
+class Projection:
+    """The columns behind a response schema, fetched without loading ORM objects.
+
+    Scalar schema fields map to columns of `model`; a field named after a
+    relationship (e.g. CommitResponse.author) is fetched through an outer
+    join and rendered with its own schema's fields, or null when absent.
+    `fields` and `expand` restrict the scalar fields and relationships.
+    """
+
+    def __init__(self, schema: type[BaseModel], model, fields: Optional[set] = None, expand: Optional[set] = None):
+        mapper = inspect(model)
+        self.schema = schema
+        self.model = model
+        self.fields: list[str] = []
+        self.columns: list = []
+        self.nested: list[tuple[str, list[str], int]] = []
+        self.joins: list[tuple] = []
+        self._narrowed: dict[tuple, Projection] = {}
+        for name, field in schema.model_fields.items():
+            if name in mapper.relationships:
+                if expand is not None and name not in expand:
+                    continue
+                relationship = mapper.relationships[name]
+                target = aliased(relationship.mapper.class_)
+                nested_fields = list(_nested_schema(field.annotation).model_fields)
+                # A null primary key means the outer join found no related row
+                self.nested.append((name, nested_fields, nested_fields.index("id")))
+                self.joins.append((getattr(model, name).of_type(target), target, nested_fields))
+            elif fields is None or name in fields:
+                self.fields.append(name)
+                self.columns.append(getattr(model, name))
+        for _, target, nested_fields in self.joins:
+            self.columns.extend(getattr(target, f) for f in nested_fields)
+
+    def narrow(self, fields: Optional[str] = None, expand: Optional[str] = None) -> "Projection":
+        """Projection for comma-separated `fields` / `expand` query parameters.
+
+        `fields` lists the attributes to return (`id` is always included) and
+        may name relationships too; `expand` lists relationships to embed.
+        Without `fields` every attribute is returned, and without either
+        parameter every relationship is embedded as before. Unknown names
+        are rejected with a 400.
+        """
+        if fields is None and expand is None:
+            return self
+        relationships = {name for name, _, _ in self.nested}
+        wanted = _split(fields)
+        embedded = _split(expand)
+        unknown = (wanted - set(self.fields) - relationships) | (embedded - relationships)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown field(s): {', '.join(sorted(unknown))}")
+        if fields is not None:
+            embedded |= wanted & relationships
+            scalars = (wanted - relationships) | {"id"}
+        else:
+            scalars = None
+        key = (frozenset(scalars) if scalars is not None else None, frozenset(embedded))
+        if key not in self._narrowed:
+            self._narrowed[key] = Projection(self.schema, self.model, scalars, embedded)
+        return self._narrowed[key]
+
+    def query(self, db: Session):
+        """A query yielding one row tuple per item; add filters as usual."""
+        query = db.query(*self.columns).select_from(self.model)
+        for relationship, _, _ in self.joins:
+            query = query.outerjoin(relationship)
+        return query
+
+    def stream(self, query, batch_size: int = 1000) -> Iterator[dict]:
+        """Yield response dicts for `query` through a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory stays flat however
+        many rows match.
+        """
+        result = query.session.execute(query.statement.execution_options(yield_per=batch_size))
+        for rows in result.partitions():
+            yield from self.to_dicts(rows)
+
+    def to_dicts(self, rows) -> list[dict]:
+        """Turn row tuples from query() into response dicts."""
+        fields, nested = self.fields, self.nested
+        width = len(fields)
+        items = []
+        for row in rows:
+            item = dict(zip(fields, row))
+            offset = width
+            for name, nested_fields, id_index in nested:
+                end = offset + len(nested_fields)
+                item[name] = dict(zip(nested_fields, row[offset:end])) if row[offset + id_index] is not None else None
+                offset = end
+            items.append(item)
+        return items
+
+
+def _split(value: Optional[str]) -> set:
+    return {part.strip() for part in value.split(",") if part.strip()} if value else set()
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode `content` as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded by dumps() without any model validation."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def render(response: Response, content: Any) -> FastJSONResponse:
+    """Encode `content`, keeping headers already set on the route's `response`."""
+    fast = FastJSONResponse(content)
+    fast.raw_headers.extend(
+        header for header in response.raw_headers if header[0] != b"content-length"
+    )
+    return fast
@@ -0,0 +1,56 @@
+"""Dialect-specific INSERT ... ON CONFLICT statements.
+
+Inserting a row that may already exist with one statement avoids the
+SELECT-then-INSERT race: the unique index decides, and the affected-row
+count tells the caller whether its row was the one written. upsert_add()
+does the same for counter rows, adding to the existing values instead.
+"""
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import Session
+
+
+def insert_ignore(db: Session, model, rows: list[dict], conflict_columns: list[str]) -> CursorResult:
+    """INSERT `rows` into `model`, skipping rows that hit the unique `conflict_columns`.
+
+    Runs as one multi-row statement; `rowcount` on the result is the number
+    of rows actually inserted. On MySQL this is INSERT IGNORE, which also
+    skips rows whose foreign keys do not resolve instead of raising, so
+    callers must not read a zero count as "already present" without checking.
+    A single row is inserted as such, so `inserted_primary_key` is available.
+    """
+    values = rows[0] if len(rows) == 1 else rows
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        stmt = sqlite.insert(model).values(values).on_conflict_do_nothing(index_elements=conflict_columns)
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(model).values(values).on_conflict_do_nothing(index_elements=conflict_columns)
+    else:
+        stmt = insert(model).values(values).prefix_with("IGNORE")
+    return db.execute(stmt)
+
+
+def upsert_add(db: Session, model, rows: list[dict], key_columns: list[str]) -> None:
+    """INSERT `rows` into `model`, or add their other values to the existing row's.
+
+    Every row must have the same keys. Used for counters: each non-key value
+    is a delta applied atomically by the database, so concurrent writers
+    never lose an update. Rows are written in key order to keep lock order
+    stable between transactions.
+    """
+    rows = sorted(rows, key=lambda row: tuple(row[column] for column in key_columns))
+    counters = [column for column in rows[0] if column not in key_columns]
+    values = rows[0] if len(rows) == 1 else rows
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite if dialect == "sqlite" else postgresql).insert(model).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: table.c[column] + stmt.excluded[column] for column in counters}
+        )
+    else:
+        stmt = mysql.insert(model).values(values)
+        stmt = stmt.on_duplicate_key_update({column: table.c[column] + stmt.inserted[column] for column in counters})
+    db.execute(stmt)
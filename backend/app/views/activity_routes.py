@@ -0,0 +1,50 @@
+"""Activity feed API routes."""
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.database import get_read_db
+from app.schemas.activity_schema import ActivityEventResponse
+from app.controllers import activity_controller
+from app.utils.pagination import page_response
+from app.utils import serialization
+
+router = APIRouter()
+
+
+@router.get("/users/{user_id}/feed", response_model=List[ActivityEventResponse])
+def get_feed(
+    user_id: int,
+    response: Response,
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get a user's feed: their own activity and activity on repositories they own or starred. Pass the X-Next-Cursor header back as `cursor` for the next page."""
+    page = activity_controller.get_feed(db, user_id, limit, cursor)
+    return serialization.render(response, page_response(response, page))
+
+
+@router.get("/users/{user_id}/activity", response_model=List[ActivityEventResponse])
+def get_user_activity(
+    user_id: int,
+    response: Response,
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get a user's own recent commits, issues and stars. Pass the X-Next-Cursor header back as `cursor` for the next page."""
+    page = activity_controller.get_user_activity(db, user_id, limit, cursor)
+    return serialization.render(response, page_response(response, page))
+
+
+@router.get("/repositories/{repo_id}/activity", response_model=List[ActivityEventResponse])
+def get_repository_activity(
+    repo_id: int,
+    response: Response,
+    limit: int = Query(30, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get a repository's recent commits, issues and stars. Pass the X-Next-Cursor header back as `cursor` for the next page."""
+    page = activity_controller.get_repository_activity(db, repo_id, limit, cursor)
+    return serialization.render(response, page_response(response, page))
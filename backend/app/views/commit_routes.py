@@ -1,32 +1,99 @@
 """Commit API routes."""
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.commit_schema import CommitCreate, CommitResponse
-from app.controllers import commit_controller
+from typing import List, Optional
+from app.database import get_create_db, get_db, get_read_db
+from app.schemas.commit_schema import CommitCreate, CommitResponse, CommitBatchResponse
+from app.controllers import commit_controller, repository_controller
+from app.utils.pagination import page_response
+from app.utils import cache, export, ndjson, serialization
+from app.utils.http_cache import cached_response, conditional_response, make_etag
 
 router = APIRouter()
 
 
 @router.post("/commits", response_model=CommitResponse, status_code=201)
-def create_commit(commit: CommitCreate, db: Session = Depends(get_db)):
+def create_commit(commit: CommitCreate, db: Session = Depends(get_create_db)):
     """Create a new commit."""
     return commit_controller.create_commit(db, commit)
 
 
 @router.get("/commits/{commit_id}", response_model=CommitResponse)
-def get_commit(commit_id: int, db: Session = Depends(get_db)):
+def get_commit(commit_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Get a commit by ID."""
-    return commit_controller.get_commit(db, commit_id)
+    body = cache.get_or_load(
+        cache.commit_key(commit_id), CommitResponse, lambda: commit_controller.get_commit(db, commit_id), cache.commit_tags
+    )
+    return cached_response(request, response, body, "created_at")
 
 
 @router.get("/repositories/{repo_id}/commits", response_model=List[CommitResponse])
 def get_repository_commits(
     repo_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all commits for a repository."""
-    return commit_controller.get_commits_by_repository(db, repo_id, skip, limit)
+    """Get commits for a repository. Pass the X-Next-Cursor header back as `cursor` for the next page. Use `fields` and `expand` to trim the payload."""
+    version, last_changed = commit_controller.get_commits_version(db, repo_id)
+    etag = make_etag(version, str(request.query_params))
+    not_modified = conditional_response(request, response, etag, last_changed)
+    if not_modified:
+        return not_modified
+    page = commit_controller.get_commits_by_repository(db, repo_id, skip, limit, cursor, fields, expand)
+    return serialization.render(response, page_response(response, page))
+
+
+@router.post("/repositories/{repo_id}/commits:batch", response_model=CommitBatchResponse)
+def create_repository_commits_batch(repo_id: int, request: Request, db: Session = Depends(get_db)):
+    """Create many commits in one request.
+
+    The body is either a JSON array of `{"message", "author_id"}` objects or,
+    with `Content-Type: application/x-ndjson`, one such object per line.
+    Items may carry `created_at` to import an existing commit, and a `nonce`
+    to tell identical imports apart. NDJSON is parsed as it is received and
+    written chunk by chunk, so it is the format for large pushes; a JSON
+    array is read whole first. Results are reported per item, in request
+    order, including NDJSON lines that are not valid JSON.
+    """
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        items = ndjson.iter_items(ndjson.read_body(request))
+    else:
+        try:
+            items = json.loads(b"".join(ndjson.read_body(request)))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Malformed JSON body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of commits")
+    return commit_controller.create_commits_batch(db, repo_id, items)
+
+
+@router.get("/repositories/{repo_id}/commits/export")
+def export_repository_commits(
+    repo_id: int,
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Stream every commit of a repository, oldest first, as NDJSON or CSV.
+
+    `since` / `until` bound `created_at` (inclusive / exclusive). The body is
+    gzipped when the client sends `Accept-Encoding: gzip`.
+    """
+    repository_controller.get_repository(db, repo_id)
+    return export.stream_export(
+        request,
+        commit_controller.COMMIT_EXPORT.fields,
+        lambda session: commit_controller.iter_commits(session, repo_id, since, until),
+        fmt,
+        f"repository-{repo_id}-commits"
+    )
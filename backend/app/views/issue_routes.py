@@ -1,36 +1,66 @@
 """Issue API routes."""
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_create_db, get_db, get_read_db
+from app.models.issue import IssueStatus
 from app.schemas.issue_schema import IssueCreate, IssueUpdate, IssueResponse
-from app.controllers import issue_controller
+from app.controllers import issue_controller, repository_controller
+from app.utils.pagination import page_response
+from app.utils import cache, export, serialization
+from app.utils.http_cache import cached_response, conditional_response, make_etag
 
 router = APIRouter()
 
+# Repository-wide issue counts sent with every issue list page (for the Open / Closed tabs)
+OPEN_ISSUES_HEADER = "X-Open-Issues-Count"
+CLOSED_ISSUES_HEADER = "X-Closed-Issues-Count"
+
 
 @router.post("/issues", response_model=IssueResponse, status_code=201)
-def create_issue(issue: IssueCreate, db: Session = Depends(get_db)):
+def create_issue(issue: IssueCreate, db: Session = Depends(get_create_db)):
     """Create a new issue."""
     return issue_controller.create_issue(db, issue)
 
 
 @router.get("/issues/{issue_id}", response_model=IssueResponse)
-def get_issue(issue_id: int, db: Session = Depends(get_db)):
+def get_issue(issue_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Get an issue by ID."""
-    return issue_controller.get_issue(db, issue_id)
+    body = cache.get_or_load(
+        cache.issue_key(issue_id), IssueResponse, lambda: issue_controller.get_issue(db, issue_id), cache.issue_tags
+    )
+    return cached_response(request, response, body, "updated_at")
 
 
 @router.get("/repositories/{repo_id}/issues", response_model=List[IssueResponse])
 def get_repository_issues(
     repo_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    status: Optional[IssueStatus] = Query(None),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all issues for a repository."""
-    return issue_controller.get_issues_by_repository(db, repo_id, skip, limit, status)
+    """Get issues for a repository, optionally only `open` or `closed` ones.
+
+    Pass the X-Next-Cursor header back as `cursor` for the next page. Use
+    `fields` and `expand` to trim the payload. The X-Open-Issues-Count and
+    X-Closed-Issues-Count headers carry the repository's totals.
+    """
+    open_count, closed_count, version, last_changed = issue_controller.get_issues_version(db, repo_id)
+    response.headers[OPEN_ISSUES_HEADER] = str(open_count)
+    response.headers[CLOSED_ISSUES_HEADER] = str(closed_count)
+    etag = make_etag(version, str(request.query_params))
+    not_modified = conditional_response(request, response, etag, last_changed)
+    if not_modified:
+        return not_modified
+    page = issue_controller.get_issues_by_repository(db, repo_id, skip, limit, status, cursor, fields, expand)
+    return serialization.render(response, page_response(response, page))
 
 
 @router.put("/issues/{issue_id}", response_model=IssueResponse)
@@ -44,3 +74,27 @@ def delete_issue(issue_id: int, db: Session = Depends(get_db)):
     """Delete an issue."""
     issue_controller.delete_issue(db, issue_id)
     return None
+
+
+@router.get("/repositories/{repo_id}/issues/export")
+def export_repository_issues(
+    repo_id: int,
+    request: Request,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Stream every issue of a repository, oldest first, as NDJSON or CSV.
+
+    `since` / `until` bound `created_at` (inclusive / exclusive). The body is
+    gzipped when the client sends `Accept-Encoding: gzip`.
+    """
+    repository_controller.get_repository(db, repo_id)
+    return export.stream_export(
+        request,
+        issue_controller.ISSUE_EXPORT.fields,
+        lambda session: issue_controller.iter_issues(session, repo_id, since, until),
+        fmt,
+        f"repository-{repo_id}-issues"
+    )
@@ -1,35 +1,96 @@
 """Repository API routes."""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
-from app.schemas.repository_schema import RepositoryCreate, RepositoryUpdate, RepositoryResponse
-from app.controllers import repository_controller
+from app.database import get_create_db, get_db, get_read_db
+from app.schemas.repository_schema import RepositoryCreate, RepositoryUpdate, RepositoryResponse, RepositoryOverview, RepositoryStats, TrendingRepository
+from app.config import settings
+from app.controllers import repository_controller, overview_controller, stats_controller, trending_controller
+from app.utils.pagination import page_response
+from app.utils import cache, serialization
+from app.utils.http_cache import cached_response
 
 router = APIRouter()
 
 
 @router.post("/repositories", response_model=RepositoryResponse, status_code=201)
-def create_repository(repo: RepositoryCreate, db: Session = Depends(get_db)):
+def create_repository(repo: RepositoryCreate, db: Session = Depends(get_create_db)):
     """Create a new repository."""
     return repository_controller.create_repository(db, repo)
 
 
 @router.get("/repositories", response_model=List[RepositoryResponse])
 def get_repositories(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     owner_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all repositories, optionally filtered by owner."""
-    return repository_controller.get_repositories(db, skip, limit, owner_id)
+    """Get repositories, optionally filtered by owner. Pass the X-Next-Cursor header back as `cursor` for the next page. Use `fields` and `expand` to trim the payload."""
+    page = repository_controller.get_repositories(db, skip, limit, owner_id, cursor, fields, expand)
+    return serialization.render(response, page_response(response, page))
+
+
+@router.get("/repositories/trending", response_model=List[TrendingRepository])
+def get_trending_repositories(
+    response: Response,
+    window: str = Query("day", pattern="^(day|week|all)$"),
+    limit: int = Query(25, ge=1, le=settings.LEADERBOARD_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    """Get the most starred public repositories of the last day or week, or of all time.
+
+    Served from precomputed leaderboards, so rankings lag by up to the
+    interval of the `refresh-leaderboards` job.
+    """
+    return serialization.render(response, trending_controller.get_trending(db, window, limit))
 
 
 @router.get("/repositories/{repo_id}", response_model=RepositoryResponse)
-def get_repository(repo_id: int, db: Session = Depends(get_db)):
+def get_repository(repo_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Get a repository by ID."""
-    return repository_controller.get_repository(db, repo_id)
+    body = cache.get_or_load(
+        cache.repository_key(repo_id),
+        RepositoryResponse,
+        lambda: repository_controller.get_repository(db, repo_id),
+        cache.repository_tags
+    )
+    return cached_response(request, response, body, "updated_at")
+
+
+@router.get("/repositories/{repo_id}/overview", response_model=RepositoryOverview)
+def get_repository_overview(
+    repo_id: int,
+    response: Response,
+    user_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Get a repository with its latest commits and issues, and whether `user_id` starred it.
+
+    Continue either list through its own endpoint with the returned cursor.
+    """
+    return serialization.render(response, overview_controller.get_repository_overview(db, repo_id, user_id, limit))
+
+
+@router.get("/repositories/{repo_id}/stats", response_model=RepositoryStats)
+def get_repository_stats(
+    repo_id: int,
+    response: Response,
+    days: int = Query(30, ge=1, le=365),
+    authors: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """Get commits per day and week, issue counts, top authors and star growth over the last `days` UTC days.
+
+    Read from rollups the write endpoints maintain, so the cost depends on
+    `days`, not on the size of the repository's history.
+    """
+    return serialization.render(response, stats_controller.get_repository_stats(db, repo_id, days, authors))
 
 
 @router.put("/repositories/{repo_id}", response_model=RepositoryResponse)
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db
+from app.database import get_read_db
 from app.schemas.user_schema import UserResponse
 from app.schemas.repository_schema import RepositoryResponse
 from app.controllers import search_controller
@@ -15,7 +15,7 @@ def search_users(
     q: str = Query(..., description="Search query"),
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search users by username or email."""
     return search_controller.search_users(db, q, skip, limit)
@@ -26,7 +26,7 @@ def search_repositories(
     q: str = Query(..., description="Search query"),
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Search repositories by name or description."""
     return search_controller.search_repositories(db, q, skip, limit)
@@ -1,48 +1,97 @@
 """Star API routes."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.schemas.repository_schema import RepositoryResponse
+from app.schemas.star_schema import StarBatchRequest, StarBatchResponse
 from app.controllers import star_controller
+from app.utils.pagination import page_response
+from app.utils import serialization
 
 router = APIRouter()
 
+# Upper bound on repository ids per batch star check
+MAX_CHECK_IDS = 1000
+
+# Upper bound on star + unstar pairs per batch write
+MAX_BATCH_PAIRS = 1000
+
 
 @router.post("/users/{user_id}/stars/{repository_id}", status_code=201)
-def star_repository(user_id: int, repository_id: int, db: Session = Depends(get_db)):
-    """Star a repository."""
-    star = star_controller.star_repository(db, user_id, repository_id)
-    return {"message": "Repository starred successfully", "star_id": star.id}
+def star_repository(user_id: int, repository_id: int, response: Response, db: Session = Depends(get_db)):
+    """Star a repository. Starring an already starred repository returns 200 with the existing star."""
+    result = star_controller.star_repository(db, user_id, repository_id)
+    if not result.created:
+        response.status_code = 200
+        return {"message": "Repository already starred", "star_id": result.star_id}
+    return {"message": "Repository starred successfully", "star_id": result.star_id}
 
 
 @router.delete("/users/{user_id}/stars/{repository_id}", status_code=204)
 def unstar_repository(user_id: int, repository_id: int, db: Session = Depends(get_db)):
-    """Unstar a repository."""
+    """Unstar a repository. Unstarring one that is not starred also returns 204."""
     star_controller.unstar_repository(db, user_id, repository_id)
     return None
 
 
+@router.post("/stars:batch", response_model=StarBatchResponse)
+def apply_star_batch(batch: StarBatchRequest, db: Session = Depends(get_db)):
+    """Star and unstar many user/repository pairs in one request (for import tools).
+
+    Both operations are idempotent; the response counts what changed.
+    """
+    if len(batch.star) + len(batch.unstar) > MAX_BATCH_PAIRS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PAIRS} pairs per request")
+    return star_controller.apply_star_batch(
+        db,
+        [(pair.user_id, pair.repository_id) for pair in batch.star],
+        [(pair.user_id, pair.repository_id) for pair in batch.unstar]
+    )
+
+
 @router.get("/users/{user_id}/stars", response_model=List[RepositoryResponse])
 def get_starred_repositories(
     user_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all repositories starred by a user."""
-    return star_controller.get_starred_repositories(db, user_id, skip, limit)
+    """Get repositories starred by a user. Pass the X-Next-Cursor header back as `cursor` for the next page. Use `fields` and `expand` to trim the payload."""
+    page = star_controller.get_starred_repositories(db, user_id, skip, limit, cursor, fields, expand)
+    return serialization.render(response, page_response(response, page))
 
 
 @router.get("/repositories/{repository_id}/stars/count")
-def get_repository_stars_count(repository_id: int, db: Session = Depends(get_db)):
+def get_repository_stars_count(repository_id: int, db: Session = Depends(get_read_db)):
     """Get the number of stars for a repository."""
     count = star_controller.get_repository_stars_count(db, repository_id)
     return {"repository_id": repository_id, "stars_count": count}
 
 
 @router.get("/users/{user_id}/stars/{repository_id}/check")
-def check_starred(user_id: int, repository_id: int, db: Session = Depends(get_db)):
+def check_starred(user_id: int, repository_id: int, db: Session = Depends(get_read_db)):
     """Check if a repository is starred by a user."""
     is_starred = star_controller.is_starred(db, user_id, repository_id)
     return {"is_starred": is_starred}
+
+
+@router.get("/users/{user_id}/stars/check")
+def check_starred_batch(
+    user_id: int,
+    ids: str = Query(..., description="Comma-separated repository ids"),
+    db: Session = Depends(get_read_db)
+):
+    """Check which of several repositories a user has starred."""
+    try:
+        repository_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(repository_ids) > MAX_CHECK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CHECK_IDS} ids per request")
+    starred = star_controller.get_starred_ids(db, user_id, repository_ids)
+    return {"is_starred": {str(repo_id): repo_id in starred for repo_id in repository_ids}}
@@ -1,10 +1,13 @@
 """User API routes."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from typing import List, Optional
+from app.database import get_db, get_read_db
 from app.schemas.user_schema import UserCreate, UserUpdate, UserResponse
 from app.controllers import user_controller
+from app.utils.pagination import page_response
+from app.utils import cache, serialization
+from app.utils.http_cache import cached_response
 
 router = APIRouter()
 
@@ -16,21 +19,33 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/users", response_model=List[UserResponse])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all users."""
-    return user_controller.get_users(db, skip, limit)
+def get_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get users. Pass the X-Next-Cursor header back as `cursor` for the next page. Use `fields` to trim the payload."""
+    page = user_controller.get_users(db, skip, limit, cursor, fields)
+    return serialization.render(response, page_response(response, page))
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Get a user by ID."""
-    return user_controller.get_user(db, user_id)
+    body = cache.get_or_load(cache.user_key(user_id), UserResponse, lambda: user_controller.get_user(db, user_id))
+    return cached_response(request, response, body)
 
 
 @router.get("/users/username/{username}", response_model=UserResponse)
-def get_user_by_username(username: str, db: Session = Depends(get_db)):
+def get_user_by_username(username: str, request: Request, response: Response, db: Session = Depends(get_read_db)):
     """Get a user by username."""
-    return user_controller.get_user_by_username(db, username)
+    body = cache.get_or_load(
+        cache.username_key(username), UserResponse, lambda: user_controller.get_user_by_username(db, username)
+    )
+    return cached_response(request, response, body)
 
 
 @router.put("/users/{user_id}", response_model=UserResponse)
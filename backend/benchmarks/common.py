@@ -0,0 +1,94 @@
+"""Shared setup for the benchmark scripts.
+
+Importing this module points the app at a throwaway SQLite database (unless
+DATABASE_URL is already set), creates the schema and turns the rate
+limiter off. seed_repository() bulk-loads history with multi-row INSERTs,
+bypassing the API, so large repositories take seconds to build.
+"""
+import os
+import secrets
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+os.environ.setdefault("LEADERBOARD_REFRESH_SECONDS", "0")
+
+import app.main  # noqa: E402,F401  (creates the schema)
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from app.models.commit import Commit  # noqa: E402
+from app.models.issue import Issue, IssueStatus  # noqa: E402
+from app.models.repository import Repository  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+# Rows per INSERT statement while seeding
+SEED_BATCH = 5000
+
+_seeded = 0
+
+
+def seed_repository(db: Session, commits: int = 0, issues: int = 0, authors: int = 10) -> int:
+    """Create a repository with `commits` commits and `issues` issues by `authors` users.
+
+    Rows are one second apart, oldest first. Returns the repository id.
+    """
+    global _seeded
+    _seeded += 1
+    prefix = f"bench{_seeded}"
+    db.execute(insert(User), [
+        {"username": f"{prefix}-user{i}", "email": f"{prefix}-user{i}@example.com"} for i in range(authors)
+    ])
+    author_ids = [row.id for row in db.query(User.id).filter(User.username.like(f"{prefix}-user%")).order_by(User.id)]
+    repo_id = db.execute(insert(Repository).values(name=prefix, owner_id=author_ids[0])).inserted_primary_key[0]
+    start = datetime(2020, 1, 1)
+    for offset in range(0, commits, SEED_BATCH):
+        db.execute(insert(Commit), [
+            {
+                "repository_id": repo_id,
+                "author_id": author_ids[i % authors],
+                "message": f"commit {i}",
+                "hash": secrets.token_hex(20),
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + SEED_BATCH, commits))
+        ])
+    for offset in range(0, issues, SEED_BATCH):
+        db.execute(insert(Issue), [
+            {
+                "repository_id": repo_id,
+                "creator_id": author_ids[i % authors],
+                "title": f"issue {i}",
+                "description": "benchmark issue",
+                "status": IssueStatus.OPEN if i % 3 else IssueStatus.CLOSED,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + SEED_BATCH, issues))
+        ])
+    db.commit()
+    return repo_id
+
+
+def best_of(runs: int, fn: Callable[[], object]) -> float:
+    """Fastest of `runs` calls to `fn`, in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(fn: Callable[[], object]) -> tuple[float, int]:
+    """Run `fn` once; return (seconds, peak bytes allocated by Python meanwhile)."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        return elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
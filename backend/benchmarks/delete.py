@@ -0,0 +1,47 @@
+"""Measure time and peak memory of deleting a repository with a large history, and its owner.
+
+    cd backend && python -m benchmarks.delete [--commits N] [--issues N]
+
+Seeds a repository and deletes it with repository_controller.delete_repository,
+then does the same deleting its owner with user_controller.delete_user.
+Peak memory is what Python allocated during the delete (tracemalloc), so
+it shows whether rows are loaded into the session.
+"""
+import argparse
+
+from benchmarks.common import best_of, peak_memory, seed_repository
+from app.controllers import repository_controller, user_controller
+from app.database import SessionLocal
+from app.models.commit import Commit
+from app.models.repository import Repository
+
+
+def seed_owned_repository(db, args) -> tuple[int, int]:
+    repo_id = seed_repository(db, commits=args.commits, issues=args.issues, authors=1)
+    return repo_id, db.query(Repository.owner_id).filter(Repository.id == repo_id).scalar()
+
+
+def main(args) -> None:
+    print(f"{args.commits} commits, {args.issues} issues")
+    db = SessionLocal()
+    try:
+        for label, delete in (
+            ("delete_repository", lambda repo_id, owner_id: repository_controller.delete_repository(db, repo_id)),
+            ("delete_user", lambda repo_id, owner_id: user_controller.delete_user(db, owner_id)),
+        ):
+            # Timed untraced on one copy, traced on another: tracemalloc slows Python down
+            repo_id, owner_id = seed_owned_repository(db, args)
+            seconds = best_of(1, lambda: delete(repo_id, owner_id))
+            assert db.query(Commit.id).filter(Commit.repository_id == repo_id).first() is None
+            repo_id, owner_id = seed_owned_repository(db, args)
+            _, peak = peak_memory(lambda: delete(repo_id, owner_id))
+            print(f"{label:18} {seconds:>8.2f} s {peak / 1e6:>8.1f} MB peak")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=100000)
+    parser.add_argument("--issues", type=int, default=10000)
+    main(parser.parse_args())
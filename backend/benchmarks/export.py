@@ -0,0 +1,69 @@
+"""Measure time and peak memory of streaming a repository's commit export.
+
+    cd backend && python -m benchmarks.export [--sizes N,N,...]
+
+For each size, seeds a repository with that many commits and sends the
+StreamingResponse built by export.stream_export (as the export route does)
+through its ASGI interface into a byte counter, as NDJSON and CSV, with and
+without gzip. Peak memory is what Python allocated while streaming
+(tracemalloc), so it shows whether memory grows with the history.
+"""
+import argparse
+import asyncio
+
+from starlette.requests import Request
+
+from benchmarks.common import peak_memory, seed_repository
+from app.controllers import commit_controller
+from app.database import SessionLocal
+from app.utils import export
+
+
+def export_size(repo_id: int, fmt: str, gzip: bool) -> int:
+    headers = [(b"accept-encoding", b"gzip")] if gzip else []
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+    response = export.stream_export(
+        request,
+        commit_controller.COMMIT_EXPORT.fields,
+        lambda session: commit_controller.iter_commits(session, repo_id),
+        fmt,
+        "benchmark",
+    )
+    sent = 0
+
+    async def receive():
+        await asyncio.sleep(3600)  # never disconnects
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    asyncio.run(response({"type": "http", "method": "GET", "path": "/", "headers": headers}, receive, send))
+    return sent
+
+
+def main(args) -> None:
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'commits':>10} {'format':8} {'gzip':5} {'seconds':>8} {'MB sent':>9} {'peak MB':>8}")
+    for size in sizes:
+        db = SessionLocal()
+        try:
+            repo_id = seed_repository(db, commits=size)
+        finally:
+            db.close()
+        for fmt in ("ndjson", "csv"):
+            for gzip in (False, True):
+                sent = 0
+
+                def run():
+                    nonlocal sent
+                    sent = export_size(repo_id, fmt, gzip)
+
+                seconds, peak = peak_memory(run)
+                print(f"{size:>10} {fmt:8} {'yes' if gzip else 'no':5} {seconds:>8.2f} {sent / 1e6:>9.1f} {peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated commit counts")
+    main(parser.parse_args())
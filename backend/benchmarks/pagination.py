@@ -0,0 +1,44 @@
+"""Compare offset (`skip`) and keyset (`cursor`) paging deep into a commit history.
+
+    cd backend && python -m benchmarks.pagination [--commits N] [--runs N]
+
+Seeds one repository and fetches a page of 100 at increasing depths, once
+with `skip` and once with the cursor of the row just before that depth.
+Prints the best-of-runs time per page in milliseconds.
+"""
+import argparse
+
+from benchmarks.common import best_of, seed_repository
+from app.controllers import commit_controller
+from app.database import SessionLocal
+from app.models.commit import Commit
+from app.utils.pagination import encode_cursor
+
+PAGE = 100
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        repo_id = seed_repository(db, commits=args.commits)
+        print(f"{args.commits} commits, page of {PAGE}")
+        print(f"{'depth':>10} {'skip ms':>10} {'cursor ms':>10}")
+        for depth in sorted({0, 1000, args.commits // 10, args.commits // 2, args.commits - PAGE}):
+            cursor = None
+            if depth:
+                created_at, row_id = db.query(Commit.created_at, Commit.id).filter(
+                    Commit.repository_id == repo_id
+                ).order_by(Commit.created_at.desc(), Commit.id.desc()).offset(depth - 1).first()
+                cursor = encode_cursor(created_at, row_id)
+            by_skip = best_of(args.runs, lambda: commit_controller.get_commits_by_repository(db, repo_id, skip=depth, limit=PAGE))
+            by_cursor = best_of(args.runs, lambda: commit_controller.get_commits_by_repository(db, repo_id, limit=PAGE, cursor=cursor))
+            print(f"{depth:>10} {by_skip * 1000:>10.2f} {by_cursor * 1000:>10.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commits", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,94 @@
+"""Measure the per-request overhead of RateLimitMiddleware.
+
+Calls the middleware directly around a trivial ASGI app, so no server,
+routing or database is involved, and subtracts the time the trivial app
+takes on its own. Requests rotate over `--clients` client addresses and
+the four route classes. Limits are set high enough that every request is
+let through, which is the common path.
+
+    cd backend && python -m benchmarks.rate_limit_overhead [--requests N] [--clients N] [--runs N]
+
+Prints the best-of-runs overhead per request in microseconds for each
+backend and exits non-zero if any exceeds --budget (default 50).
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.utils import rate_limit
+
+LIMITS = {name: [1e9, 10 ** 9] for name in ("read", "write", "search", "export")}
+ROUTES = [
+    ("GET", "/api/v1/repositories/1"),
+    ("POST", "/api/v1/commits"),
+    ("GET", "/api/v1/search/repositories"),
+    ("GET", "/api/v1/repositories/1/export"),
+]
+
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send(message):
+    pass
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def scopes(clients: int, forwarded: bool) -> list[dict]:
+    result = []
+    for i in range(clients):
+        method, path = ROUTES[i % len(ROUTES)]
+        address = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+        headers = [(b"x-forwarded-for", f"{address}, 10.0.0.1".encode())] if forwarded else []
+        result.append({"type": "http", "method": method, "path": path, "headers": headers, "client": (address, 5000)})
+    return result
+
+
+async def time_requests(handler, requests: list[dict], count: int) -> float:
+    n = len(requests)
+    start = time.perf_counter()
+    for i in range(count):
+        await handler(requests[i % n], receive, send)
+    return time.perf_counter() - start
+
+
+async def overhead(backend, forwarded: bool, args) -> float:
+    rate_limit.configure(backend)
+    middleware = rate_limit.RateLimitMiddleware(app, LIMITS, max_concurrent=100, trust_forwarded=forwarded)
+    requests = scopes(args.clients, forwarded)
+    best = float("inf")
+    for _ in range(args.runs):
+        limited = await time_requests(middleware, requests, args.requests)
+        bare = await time_requests(app, requests, args.requests)
+        best = min(best, (limited - bare) / args.requests)
+    return best * 1e6
+
+
+async def main(args) -> int:
+    cases = [
+        ("memory", rate_limit.MemoryBuckets, False),
+        ("memory with X-Forwarded-For", rate_limit.MemoryBuckets, True),
+        ("shared over LocalStore", lambda: rate_limit.SharedBuckets(rate_limit.LocalStore()), False),
+        ("none", rate_limit.NoBuckets, False),
+    ]
+    failed = False
+    for label, make_backend, forwarded in cases:
+        micros = await overhead(make_backend(), forwarded, args)
+        failed = failed or micros > args.budget
+        print(f"{label:30} {micros:6.1f} us/request")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=50.0, help="microseconds per request")
+    sys.exit(asyncio.run(main(parser.parse_args())))
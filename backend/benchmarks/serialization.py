@@ -0,0 +1,81 @@
+"""Compare rendering a page of commits through Pydantic models and through a Projection.
+
+    cd backend && python -m benchmarks.serialization [--page N] [--runs N]
+
+The model path is what a route with `response_model` did before: load ORM
+objects with their authors, validate one CommitResponse per row, run
+jsonable_encoder and encode with JSONResponse. The projection path selects
+row tuples through COMMIT_LIST and encodes them with serialization.dumps
+(orjson when installed, then again with the standard json module).
+Prints the best-of-runs time per page in milliseconds, for encoding alone
+and including the query.
+"""
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import joinedload
+
+from benchmarks.common import best_of, seed_repository
+from app.controllers.commit_controller import COMMIT_LIST
+from app.database import SessionLocal
+from app.models.commit import Commit
+from app.schemas.commit_schema import CommitResponse
+from app.utils import serialization
+
+
+def encode_models(objects) -> bytes:
+    return JSONResponse(jsonable_encoder([CommitResponse.model_validate(obj) for obj in objects])).body
+
+
+def encode_rows(rows) -> bytes:
+    return serialization.dumps(COMMIT_LIST.to_dicts(rows))
+
+
+def main(args) -> None:
+    db = SessionLocal()
+    try:
+        repo_id = seed_repository(db, commits=args.page)
+        order = (Commit.created_at.desc(), Commit.id.desc())
+
+        def load_objects():
+            db.expunge_all()
+            return db.query(Commit).options(joinedload(Commit.author)).filter(
+                Commit.repository_id == repo_id
+            ).order_by(*order).limit(args.page).all()
+
+        def load_rows():
+            return COMMIT_LIST.query(db).filter(Commit.repository_id == repo_id).order_by(*order).limit(args.page).all()
+
+        objects, rows = load_objects(), load_rows()
+        assert encode_models(objects) is not None and len(rows) == args.page
+        orjson = serialization.orjson
+        cases = [
+            ("models", lambda: encode_models(objects), lambda: encode_models(load_objects())),
+            ("projection" + (" (orjson)" if orjson else ""), lambda: encode_rows(rows), lambda: encode_rows(load_rows())),
+        ]
+        if orjson:
+            def without_orjson(fn):
+                def run():
+                    serialization.orjson = None
+                    try:
+                        return fn()
+                    finally:
+                        serialization.orjson = orjson
+                return run
+            cases.append(("projection (json)", without_orjson(lambda: encode_rows(rows)),
+                          without_orjson(lambda: encode_rows(load_rows()))))
+
+        print(f"page of {args.page} commits with authors")
+        print(f"{'path':20} {'encode ms':>10} {'query+encode ms':>16}")
+        for label, encode, end_to_end in cases:
+            print(f"{label:20} {best_of(args.runs, encode) * 1000:>10.2f} {best_of(args.runs, end_to_end) * 1000:>16.2f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=20)
+    main(parser.parse_args())
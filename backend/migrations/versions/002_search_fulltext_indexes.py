@@ -0,0 +1,45 @@
+"""Add full-text search indexes
+
+Revision ID: 002_search_fulltext
+Revises: 001_initial
+Create Date: 2024-01-02 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_search_fulltext'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+# Searchable columns per indexed table, as in app.utils.search_index
+FTS5_SOURCES = {
+    'user': ('users', ('username', 'email')),
+    'repository': ('repositories', ('name', 'description')),
+}
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.create_index('ft_users_username_email', 'users', ['username', 'email'], mysql_prefix='FULLTEXT')
+        op.create_index('ft_repositories_name_description', 'repositories', ['name', 'description'], mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        # Fails on a SQLite built without FTS5 instead of leaving search unindexed
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "kind UNINDEXED, ref_id UNINDEXED, body, prefix='2 3')"
+        )
+        for kind, (table, columns) in FTS5_SOURCES.items():
+            body = " || ' ' || ".join(f"coalesce({col}, '')" for col in columns)
+            op.execute(f"INSERT INTO search_index (kind, ref_id, body) SELECT '{kind}', id, {body} FROM {table}")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ft_repositories_name_description', table_name='repositories')
+        op.drop_index('ft_users_username_email', table_name='users')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE search_index")
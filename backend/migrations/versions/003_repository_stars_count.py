@@ -0,0 +1,29 @@
+"""Add denormalized stars_count to repositories
+
+Revision ID: 003_stars_count
+Revises: 002_search_fulltext
+Create Date: 2024-01-03 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_stars_count'
+down_revision = '002_search_fulltext'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('repositories', sa.Column('stars_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill from existing stars, leaving updated_at untouched
+    op.execute(
+        "UPDATE repositories SET stars_count = "
+        "(SELECT COUNT(*) FROM stars WHERE stars.repository_id = repositories.id), "
+        "updated_at = updated_at"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('repositories', 'stars_count')
@@ -0,0 +1,36 @@
+"""Add commit and issue list versions to repositories
+
+Revision ID: 004_list_versions
+Revises: 003_stars_count
+Create Date: 2024-01-04 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_list_versions'
+down_revision = '003_stars_count'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('repositories', sa.Column('commits_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('repositories', sa.Column('commits_updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('repositories', sa.Column('issues_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('repositories', sa.Column('issues_updated_at', sa.DateTime(timezone=True), nullable=True))
+    # Backfill from existing commits and issues, leaving updated_at untouched
+    op.execute(
+        "UPDATE repositories SET "
+        "commits_updated_at = (SELECT MAX(commits.created_at) FROM commits WHERE commits.repository_id = repositories.id), "
+        "issues_updated_at = (SELECT MAX(issues.updated_at) FROM issues WHERE issues.repository_id = repositories.id), "
+        "updated_at = updated_at"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('repositories', 'issues_updated_at')
+    op.drop_column('repositories', 'issues_version')
+    op.drop_column('repositories', 'commits_updated_at')
+    op.drop_column('repositories', 'commits_version')
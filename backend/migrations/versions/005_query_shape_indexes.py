@@ -0,0 +1,57 @@
+"""Add composite indexes matching the controllers' query shapes
+
+Revision ID: 005_query_indexes
+Revises: 004_list_versions
+Create Date: 2024-01-05 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005_query_indexes'
+down_revision = '004_list_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Commits: repository history ordered by (created_at, id), and by author
+    op.create_index('ix_commits_repository_created', 'commits', ['repository_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_commits_repository_id', table_name='commits')
+    op.create_index('ix_commits_author_id', 'commits', ['author_id'], unique=False)
+
+    # Issues: repository listing with and without a status filter, and by creator
+    op.create_index('ix_issues_repository_created', 'issues', ['repository_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_issues_repository_status_created', 'issues', ['repository_id', 'status', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_issues_repository_id', table_name='issues')
+    op.create_index('ix_issues_creator_id', 'issues', ['creator_id'], unique=False)
+
+    # Stars: a user's starred list and per-repository lookups
+    op.create_index('ix_stars_user_created', 'stars', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_stars_repository_id', 'stars', ['repository_id'], unique=False)
+
+    # Repositories: one name per owner, and newest-first listings
+    op.create_index('uq_repositories_owner_name', 'repositories', ['owner_id', 'name'], unique=True)
+    op.create_index('ix_repositories_owner_created', 'repositories', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_repositories_created', 'repositories', ['created_at', 'id'], unique=False)
+    op.drop_index('ix_repositories_owner_id', table_name='repositories')
+
+    # Users: newest-first listing
+    op.create_index('ix_users_created', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created', table_name='users')
+    op.create_index('ix_repositories_owner_id', 'repositories', ['owner_id'], unique=False)
+    op.drop_index('ix_repositories_created', table_name='repositories')
+    op.drop_index('ix_repositories_owner_created', table_name='repositories')
+    op.drop_index('uq_repositories_owner_name', table_name='repositories')
+    op.drop_index('ix_stars_repository_id', table_name='stars')
+    op.drop_index('ix_stars_user_created', table_name='stars')
+    op.drop_index('ix_issues_creator_id', table_name='issues')
+    op.create_index('ix_issues_repository_id', 'issues', ['repository_id'], unique=False)
+    op.drop_index('ix_issues_repository_status_created', table_name='issues')
+    op.drop_index('ix_issues_repository_created', table_name='issues')
+    op.drop_index('ix_commits_author_id', table_name='commits')
+    op.create_index('ix_commits_repository_id', 'commits', ['repository_id'], unique=False)
+    op.drop_index('ix_commits_repository_created', table_name='commits')
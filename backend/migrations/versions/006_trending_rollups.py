@@ -0,0 +1,51 @@
+"""Add daily repository rollups and trending leaderboards
+
+Revision ID: 006_trending
+Revises: 005_query_indexes
+Create Date: 2024-01-06 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_trending'
+down_revision = '005_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'repository_daily_stats',
+        sa.Column('repository_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('stars', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('commits', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['repository_id'], ['repositories.id']),
+        sa.PrimaryKeyConstraint('repository_id', 'day'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_repository_daily_stats_day', 'repository_daily_stats', ['day', 'repository_id'], unique=False)
+
+    op.create_table(
+        'leaderboard_entries',
+        sa.Column('period', sa.String(length=8), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('repository_id', sa.Integer(), nullable=False),
+        sa.Column('stars', sa.Integer(), nullable=False),
+        sa.Column('commits', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.PrimaryKeyConstraint('period', 'position'),
+        mysql_engine='InnoDB'
+    )
+
+    # All-time ranking of public repositories by stars
+    op.create_index('ix_repositories_public_stars', 'repositories', ['is_public', 'stars_count', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_repositories_public_stars', table_name='repositories')
+    op.drop_table('leaderboard_entries')
+    op.drop_index('ix_repository_daily_stats_day', table_name='repository_daily_stats')
+    op.drop_table('repository_daily_stats')
@@ -0,0 +1,65 @@
+"""Add activity events and feed timelines
+
+Revision ID: 007_activity
+Revises: 006_trending
+Create Date: 2024-01-07 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.config import settings
+
+# revision identifiers, used by Alembic.
+revision = '007_activity'
+down_revision = '006_trending'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('actor_id', sa.Integer(), nullable=False),
+        sa.Column('repository_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.Enum('COMMIT', 'ISSUE', 'STAR', name='activitykind'), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['repository_id'], ['repositories.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_activity_events_actor', 'activity_events', ['actor_id', 'id'], unique=False)
+    op.create_index('ix_activity_events_repository', 'activity_events', ['repository_id', 'id'], unique=False)
+    op.create_index('ix_activity_events_subject', 'activity_events', ['kind', 'subject_id'], unique=False)
+
+    op.create_table(
+        'timeline_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['event_id'], ['activity_events.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'event_id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_timeline_entries_event', 'timeline_entries', ['event_id'], unique=False)
+
+    op.add_column('repositories', sa.Column('feed_fanout_on_read', sa.Boolean(), server_default=sa.false(), nullable=False))
+    # Backfill from the current threshold, leaving updated_at untouched
+    op.execute(
+        "UPDATE repositories SET feed_fanout_on_read = 1, updated_at = updated_at "
+        f"WHERE stars_count > {int(settings.FEED_FANOUT_MAX_STARS)}"
+    )
+    op.create_index('ix_repositories_feed_fanout_on_read', 'repositories', ['feed_fanout_on_read', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_repositories_feed_fanout_on_read', table_name='repositories')
+    op.drop_column('repositories', 'feed_fanout_on_read')
+    op.drop_index('ix_timeline_entries_event', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
+    op.drop_index('ix_activity_events_subject', table_name='activity_events')
+    op.drop_index('ix_activity_events_repository', table_name='activity_events')
+    op.drop_index('ix_activity_events_actor', table_name='activity_events')
+    op.drop_table('activity_events')
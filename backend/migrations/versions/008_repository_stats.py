@@ -0,0 +1,49 @@
+"""Add repository issue counts and per-author commit rollups
+
+Revision ID: 008_repository_stats
+Revises: 007_activity
+Create Date: 2024-01-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_repository_stats'
+down_revision = '007_activity'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('repositories', sa.Column('open_issues_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('repositories', sa.Column('closed_issues_count', sa.Integer(), server_default='0', nullable=False))
+    # Backfill from existing issues, leaving updated_at untouched
+    op.execute(
+        "UPDATE repositories SET "
+        "open_issues_count = (SELECT COUNT(*) FROM issues WHERE issues.repository_id = repositories.id AND issues.status = 'OPEN'), "
+        "closed_issues_count = (SELECT COUNT(*) FROM issues WHERE issues.repository_id = repositories.id AND issues.status = 'CLOSED'), "
+        "updated_at = updated_at"
+    )
+
+    op.create_table(
+        'repository_author_stats',
+        sa.Column('repository_id', sa.Integer(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('commits', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['repository_id'], ['repositories.id'], ),
+        sa.ForeignKeyConstraint(['author_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('repository_id', 'author_id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_repository_author_stats_commits', 'repository_author_stats', ['repository_id', 'commits', 'author_id'], unique=False)
+    op.create_index('ix_repository_author_stats_author', 'repository_author_stats', ['author_id'], unique=False)
+    # Existing history is counted by `python -m app.cli backfill-stats`
+
+
+def downgrade() -> None:
+    op.drop_index('ix_repository_author_stats_author', table_name='repository_author_stats')
+    op.drop_index('ix_repository_author_stats_commits', table_name='repository_author_stats')
+    op.drop_table('repository_author_stats')
+    op.drop_column('repositories', 'closed_issues_count')
+    op.drop_column('repositories', 'open_issues_count')
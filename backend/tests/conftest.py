@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+_data_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_data_dir}/test.db"
+# Per-request query counts from RequestStats, see tests/test_query_counts.py
+os.environ["METRICS_SERVER_TIMING"] = "true"
+# Leaderboards are rebuilt once after seeding instead of on a timer
+os.environ["LEADERBOARD_REFRESH_SECONDS"] = "0"
+# Seeding writes faster than any client would; keep it out of the limiter
+os.environ["RATE_LIMIT_BACKEND"] = "none"
+os.environ["MAX_CONCURRENT_REQUESTS"] = "0"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.controllers import trending_controller  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = "/api/v1"
+USERS = 8
+COMMITS = 45
+ISSUES = 30
+
+
+def _post(client, path, json=None):
+    response = client.post(f"{API}{path}", json=json)
+    assert response.is_success, f"seeding POST {path} failed: {response.status_code} {response.text}"
+    return response.json()
+
+
+def _seed(client):
+    for i in range(USERS):
+        _post(client, "/users", {"username": f"user{i}", "email": f"user{i}@example.com"})
+    for i in range(USERS):
+        _post(client, "/repositories", {"name": f"repo{i}", "description": "repo", "owner_id": i + 1})
+    for i in range(COMMITS):
+        _post(client, "/commits", {"message": f"commit {i}", "repository_id": 1, "author_id": i % USERS + 1})
+    for i in range(ISSUES):
+        _post(client, "/issues", {"title": f"issue {i}", "repository_id": 1, "creator_id": i % USERS + 1})
+    for user_id in range(1, USERS + 1):
+        for repo_id in range(1, USERS + 1):
+            if user_id != repo_id:
+                _post(client, f"/users/{user_id}/stars/{repo_id}")
+    db = SessionLocal()
+    try:
+        trending_controller.refresh_leaderboards(db)
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        _seed(test_client)
+        yield test_client
@@ -0,0 +1,72 @@
+"""Cached entities are invalidated by tag, without scanning the cache."""
+from app.utils import cache
+from tests.conftest import API
+
+
+class FakeRedis:
+    """The subset of redis-py used by RedisCache, minus scan_iter."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+
+    def expire(self, key, seconds):
+        pass
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        pass
+
+
+def test_lru_tags_follow_eviction():
+    lru = cache.LRUCache(max_entries=2, ttl=60)
+    lru.set("a", 1, ["tag:x"])
+    lru.set("b", 2, ["tag:x", "tag:y"])
+    lru.set("c", 3, ["tag:y"])
+    assert lru.get("a") is None
+    lru.delete_tags("tag:x")
+    assert lru.get("b") is None
+    assert lru.get("c") == 3
+    assert "tag:x" not in lru._tagged
+
+
+def test_redis_delete_tags():
+    redis_cache = cache.RedisCache(FakeRedis(), ttl=60)
+    redis_cache.set("commit:1", {"id": 1}, ["tag:user:1", "tag:repository:1"])
+    redis_cache.set("commit:2", {"id": 2}, ["tag:user:2", "tag:repository:1"])
+    redis_cache.delete_tags("tag:user:1")
+    assert redis_cache.get("commit:1") is None
+    assert redis_cache.get("commit:2") == {"id": 2}
+    redis_cache.delete_tags("tag:repository:1")
+    assert redis_cache.get("commit:2") is None
+
+
+def test_user_rename_refreshes_embedded_author(client):
+    user = client.post(f"{API}/users", json={"username": "renamed", "email": "renamed@example.com"}).json()
+    repo = client.post(f"{API}/repositories", json={"name": "renamed-repo", "owner_id": user["id"]}).json()
+    commit = client.post(
+        f"{API}/commits", json={"message": "m", "repository_id": repo["id"], "author_id": user["id"]}
+    ).json()
+    assert client.get(f"{API}/commits/{commit['id']}").json()["author"]["username"] == "renamed"
+    assert client.put(f"{API}/users/{user['id']}", json={"username": "renamed2"}).status_code == 200
+    assert client.get(f"{API}/commits/{commit['id']}").json()["author"]["username"] == "renamed2"
+    assert client.get(f"{API}/repositories/{repo['id']}").json()["owner"]["username"] == "renamed2"
+    assert client.delete(f"{API}/repositories/{repo['id']}").status_code == 204
+    assert client.get(f"{API}/commits/{commit['id']}").status_code == 404
@@ -0,0 +1,55 @@
+"""Batch pushes: NDJSON is parsed as it streams in, a JSON array is still accepted."""
+import json
+
+from app.utils import ndjson
+from tests.conftest import API
+
+
+def setup_repository(client, name):
+    user = client.post(f"{API}/users", json={"username": name, "email": f"{name}@example.com"}).json()
+    repo = client.post(f"{API}/repositories", json={"name": name, "owner_id": user["id"]}).json()
+    return user["id"], repo["id"]
+
+
+def test_lines_are_split_across_chunks():
+    chunks = [b'{"a": 1}\n{"a"', b': 2}\n\n', b'not json\n{"a": 3}']
+    items = list(ndjson.iter_items(chunks))
+    assert items[:2] == [{"a": 1}, {"a": 2}] and items[3] == {"a": 3}
+    assert isinstance(items[2], ndjson.MalformedLine)
+
+
+def test_streamed_ndjson_push(client):
+    user_id, repo_id = setup_repository(client, "batch-stream")
+
+    def body():
+        # Split every line in two so no chunk ends on a line boundary
+        for i in range(25):
+            line = json.dumps({"message": f"commit {i}", "author_id": user_id}).encode() + b"\n"
+            yield line[:7]
+            yield line[7:]
+        yield b"{broken\n"
+        yield json.dumps({"message": "last", "author_id": 999999}).encode()
+
+    response = client.post(
+        f"{API}/repositories/{repo_id}/commits:batch",
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["failed"]) == (25, 2)
+    assert result["results"][25]["error"].startswith("Malformed JSON")
+    assert result["results"][26]["error"] == "Author not found"
+    commits = client.get(f"{API}/repositories/{repo_id}/commits", params={"limit": 100}).json()
+    assert [commit["message"] for commit in commits] == [f"commit {i}" for i in reversed(range(25))]
+
+
+def test_json_array_push(client):
+    user_id, repo_id = setup_repository(client, "batch-array")
+    response = client.post(
+        f"{API}/repositories/{repo_id}/commits:batch", json=[{"message": "one", "author_id": user_id}]
+    )
+    assert response.status_code == 200 and response.json()["created"] == 1
+
+    assert client.post(f"{API}/repositories/{repo_id}/commits:batch", content=b"[{").status_code == 400
+    assert client.post(f"{API}/repositories/{repo_id}/commits:batch", json={"message": "x"}).status_code == 400
@@ -0,0 +1,56 @@
+"""Commit hashes: new commits never collide, imports are deduplicated and chain onto the head."""
+from datetime import datetime
+
+from app.utils.helpers import commit_hash
+from tests.conftest import API
+
+
+def setup_repository(client, name):
+    user = client.post(f"{API}/users", json={"username": name, "email": f"{name}@example.com"}).json()
+    repo = client.post(f"{API}/repositories", json={"name": name, "owner_id": user["id"]}).json()
+    return user["id"], repo["id"]
+
+
+def push(client, repo_id, items):
+    response = client.post(f"{API}/repositories/{repo_id}/commits:batch", json=items)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_identical_new_commits_do_not_collide(client):
+    user_id, repo_id = setup_repository(client, "hash-live")
+    commit = {"message": "fix typo", "repository_id": repo_id, "author_id": user_id}
+    first = client.post(f"{API}/commits", json=commit)
+    second = client.post(f"{API}/commits", json=commit)
+    assert first.status_code == second.status_code == 201
+    assert first.json()["hash"] != second.json()["hash"]
+
+    result = push(client, repo_id, [{"message": "fix typo", "author_id": user_id}] * 2)
+    assert result["created"] == 2 and result["duplicates"] == 0
+
+
+def test_import_chains_onto_head_and_resend_is_duplicate(client):
+    user_id, repo_id = setup_repository(client, "hash-import")
+    head = client.post(
+        f"{API}/commits", json={"message": "initial", "repository_id": repo_id, "author_id": user_id}
+    ).json()["hash"]
+    created_at = datetime(2030, 1, 1, 12, 0, 0, 250000)
+    items = [
+        {"message": "imported", "author_id": user_id, "created_at": created_at.isoformat()},
+        {"message": "imported", "author_id": user_id, "created_at": created_at.isoformat(), "nonce": "b"},
+    ]
+
+    first = push(client, repo_id, items)
+    assert first["created"] == 2
+    hashes = [result["hash"] for result in first["results"]]
+    assert hashes[0] == commit_hash(repo_id, head, user_id, created_at, "imported")
+    assert hashes[1] == commit_hash(repo_id, hashes[0], user_id, created_at, "imported", "b")
+
+    again = push(client, repo_id, items)
+    assert again["created"] == 0 and again["duplicates"] == 2
+    assert [result["hash"] for result in again["results"]] == hashes
+
+
+def test_hash_keeps_microseconds():
+    base = datetime(2030, 1, 1, 12, 0, 0)
+    assert commit_hash(1, None, 1, base, "m") != commit_hash(1, None, 1, base.replace(microsecond=1), "m")
@@ -0,0 +1,32 @@
+"""List ETags change with every write that changes the page, and only then."""
+from tests.conftest import API
+
+
+def etag(client, path):
+    response = client.get(f"{API}{path}")
+    assert response.status_code == 200
+    assert client.get(f"{API}{path}", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    return response.headers["etag"]
+
+
+def test_list_etags_follow_writes(client):
+    user = client.post(f"{API}/users", json={"username": "etag", "email": "etag@example.com"}).json()
+    repo = client.post(f"{API}/repositories", json={"name": "etag-repo", "owner_id": user["id"]}).json()
+    commits, issues = f"/repositories/{repo['id']}/commits", f"/repositories/{repo['id']}/issues"
+    before = etag(client, commits), etag(client, issues)
+
+    client.post(f"{API}/commits", json={"message": "m", "repository_id": repo["id"], "author_id": user["id"]})
+    client.post(f"{API}/issues", json={"title": "t", "repository_id": repo["id"], "creator_id": user["id"]})
+    after_writes = etag(client, commits), etag(client, issues)
+    assert after_writes[0] != before[0] and after_writes[1] != before[1]
+    assert (etag(client, commits), etag(client, issues)) == after_writes
+
+    # The pages embed the author and creator
+    client.put(f"{API}/users/{user['id']}", json={"username": "etag2"})
+    after_rename = etag(client, commits), etag(client, issues)
+    assert after_rename[0] != after_writes[0] and after_rename[1] != after_writes[1]
+
+
+def test_list_version_of_missing_repository_is_404(client):
+    assert client.get(f"{API}/repositories/999999/commits").status_code == 404
+    assert client.get(f"{API}/repositories/999999/issues").status_code == 404
@@ -0,0 +1,47 @@
+"""An interrupted user delete leaves consistent counters and finishes when run again."""
+import pytest
+
+from app.controllers import commit_controller, user_controller
+from app.database import SessionLocal
+from tests.conftest import API
+
+
+def create_user(client, name):
+    return client.post(f"{API}/users", json={"username": name, "email": f"{name}@example.com"}).json()["id"]
+
+
+def test_interrupted_delete_user_resumes(client, monkeypatch):
+    owner = create_user(client, "resume-owner")
+    leaving = create_user(client, "resume-leaving")
+    repo_id = client.post(f"{API}/repositories", json={"name": "resume", "owner_id": owner}).json()["id"]
+    own_repo = client.post(f"{API}/repositories", json={"name": "resume-own", "owner_id": leaving}).json()["id"]
+    assert client.post(f"{API}/users/{leaving}/stars/{repo_id}").status_code == 201
+    for i in range(3):
+        client.post(f"{API}/commits", json={"message": f"c{i}", "repository_id": repo_id, "author_id": leaving})
+        client.post(f"{API}/issues", json={"title": f"i{i}", "repository_id": repo_id, "creator_id": leaving})
+    # Cache the starred repository with its counters
+    assert client.get(f"{API}/repositories/{repo_id}").json()["stars_count"] == 1
+
+    def interrupted(db, user_id, chunk_size=None):
+        raise RuntimeError("worker killed")
+
+    monkeypatch.setattr(commit_controller, "remove_user_commits", interrupted)
+    db = SessionLocal()
+    try:
+        with pytest.raises(RuntimeError):
+            user_controller.delete_user(db, leaving)
+    finally:
+        db.close()
+    monkeypatch.undo()
+
+    # Half deleted: the user and their data past the interruption remain, the star is gone everywhere
+    assert client.get(f"{API}/users/{leaving}").status_code == 200
+    assert client.get(f"{API}/repositories/{repo_id}").json()["stars_count"] == 0
+    assert len(client.get(f"{API}/repositories/{repo_id}/commits").json()) == 3
+
+    assert client.delete(f"{API}/users/{leaving}").status_code == 204
+    assert client.get(f"{API}/users/{leaving}").status_code == 404
+    assert client.get(f"{API}/repositories/{own_repo}").status_code == 404
+    repo = client.get(f"{API}/repositories/{repo_id}").json()
+    assert repo["stars_count"] == 0 and repo["open_issues_count"] == 0
+    assert client.get(f"{API}/repositories/{repo_id}/commits").json() == []
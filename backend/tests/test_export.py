@@ -0,0 +1,33 @@
+"""Exports stream a repository's whole history, oldest first, in every format."""
+import csv
+import io
+import json
+
+from tests.conftest import API, COMMITS, ISSUES
+
+
+def export(client, path, fmt="ndjson", compress=False):
+    headers = {"Accept-Encoding": "gzip" if compress else "identity"}
+    response = client.get(f"{API}{path}", params={"format": fmt}, headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_commit_export_ndjson_and_gzip(client):
+    plain = export(client, "/repositories/1/commits/export")
+    rows = [json.loads(line) for line in plain.text.splitlines()]
+    assert len(rows) == COMMITS
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+    compressed = export(client, "/repositories/1/commits/export", compress=True)
+    assert compressed.headers["content-encoding"] == "gzip"
+    # The client decodes the gzip body
+    assert compressed.content == plain.content
+
+
+def test_issue_export_csv(client):
+    response = export(client, "/repositories/1/issues/export", fmt="csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == ISSUES
+    assert {row["status"] for row in rows} <= {"open", "closed"}
@@ -0,0 +1,50 @@
+"""Feeds of popular repositories: merged on read once flagged, and never lost afterwards."""
+from app.config import settings
+from app.database import SessionLocal
+from app.models.repository import Repository
+from tests.conftest import API
+
+
+def create_user(client, name):
+    return client.post(f"{API}/users", json={"username": name, "email": f"{name}@example.com"}).json()["id"]
+
+
+def commit(client, repo_id, author_id, message):
+    response = client.post(f"{API}/commits", json={"message": message, "repository_id": repo_id, "author_id": author_id})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def feed_commits(client, user_id):
+    events = client.get(f"{API}/users/{user_id}/feed", params={"limit": 100}).json()
+    return {event["subject_id"] for event in events if event["kind"] == "commit"}
+
+
+def flagged(repo_id):
+    db = SessionLocal()
+    try:
+        return db.query(Repository.feed_fanout_on_read).filter(Repository.id == repo_id).scalar()
+    finally:
+        db.close()
+
+
+def test_flag_is_sticky_and_feeds_keep_events(client, monkeypatch):
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_STARS", 1)
+    owner = create_user(client, "fanout-owner")
+    fans = [create_user(client, f"fanout-fan{i}") for i in range(2)]
+    repo_id = client.post(f"{API}/repositories", json={"name": "fanout", "owner_id": owner}).json()["id"]
+
+    assert client.post(f"{API}/users/{fans[0]}/stars/{repo_id}").status_code == 201
+    before = commit(client, repo_id, owner, "fanned out on write")
+    assert not flagged(repo_id)
+
+    assert client.post(f"{API}/users/{fans[1]}/stars/{repo_id}").status_code == 201
+    assert flagged(repo_id)
+    during = commit(client, repo_id, owner, "merged on read")
+    assert {before, during} <= feed_commits(client, fans[0])
+
+    # Dropping back below the threshold keeps the flag, so `during` stays in the feed
+    assert client.delete(f"{API}/users/{fans[1]}/stars/{repo_id}").status_code == 204
+    assert flagged(repo_id)
+    after = commit(client, repo_id, owner, "still merged on read")
+    assert {before, during, after} <= feed_commits(client, fans[0])
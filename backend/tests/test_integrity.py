@@ -0,0 +1,25 @@
+"""Rejected inserts are reported by the constraint that rejected them."""
+from tests.conftest import API
+
+
+def test_create_repository_errors(client):
+    missing_owner = client.post(f"{API}/repositories", json={"name": "orphan", "owner_id": 999999})
+    assert missing_owner.status_code == 404
+    assert missing_owner.json()["detail"] == "Owner not found"
+
+    duplicate = client.post(f"{API}/repositories", json={"name": "repo0", "owner_id": 1})
+    assert duplicate.status_code == 400
+    assert duplicate.json()["detail"] == "Repository name already exists for this owner"
+
+    # The same name under another owner is fine
+    assert client.post(f"{API}/repositories", json={"name": "repo0", "owner_id": 2}).status_code == 201
+
+
+def test_created_rows_are_returned_without_reload(client):
+    response = client.post(f"{API}/issues", json={"title": "fresh", "repository_id": 1, "creator_id": 1})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["title"] == "fresh" and body["status"] == "open" and body["created_at"]
+    # Insert, issue counters, event, fan-out, then the creator for the response;
+    # an expiring session adds a sixth query reloading the issue
+    assert 'desc="5 queries"' in response.headers["server-timing"]
@@ -0,0 +1,33 @@
+"""Cursor pagination walks a list exactly once, in the same order as offset paging."""
+from tests.conftest import API, COMMITS
+
+
+def walk(client, path, limit):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"{API}{path}", params=params)
+        assert response.status_code == 200
+        ids += [item["id"] for item in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+def test_cursor_walk_matches_offset_order(client):
+    # Seeded commits share created_at seconds, so ties are broken by id
+    ids = walk(client, "/repositories/1/commits", 10)
+    assert len(ids) == len(set(ids)) == COMMITS
+    by_offset = [
+        item["id"]
+        for skip in range(0, COMMITS, 10)
+        for item in client.get(f"{API}/repositories/1/commits", params={"skip": skip, "limit": 10}).json()
+    ]
+    assert ids == by_offset
+
+
+def test_overview_limit_is_bounded(client):
+    for limit in (0, 101, 100000):
+        assert client.get(f"{API}/repositories/1/overview", params={"limit": limit}).status_code == 422
+    overview = client.get(f"{API}/repositories/1/overview", params={"limit": 5}).json()
+    assert len(overview["commits"]) == 5
@@ -0,0 +1,47 @@
+"""Every list endpoint issues the same number of queries whatever its page size.
+
+A count that grows with `limit` means some relationship is loaded per row.
+Counts come from the `Server-Timing` header written by `RequestStats`.
+"""
+import re
+
+import pytest
+
+from tests.conftest import API
+
+LIST_ENDPOINTS = [
+    "/users",
+    "/repositories",
+    "/repositories/1/commits",
+    "/repositories/1/issues",
+    "/repositories/1/overview",
+    "/repositories/trending",
+    "/users/1/stars",
+    "/users/1/feed",
+    "/users/1/activity",
+    "/repositories/1/activity",
+    "/search/users?q=user",
+    "/search/repositories?q=repo",
+]
+
+SMALL_PAGE = 2
+LARGE_PAGE = 20
+
+
+def query_count(client, path, limit):
+    separator = "&" if "?" in path else "?"
+    response = client.get(f"{API}{path}{separator}limit={limit}")
+    assert response.status_code == 200, response.text
+    match = re.search(r'desc="(\d+) queries"', response.headers["server-timing"])
+    assert match, response.headers["server-timing"]
+    return int(match.group(1)), response.json()
+
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_query_count_independent_of_page_size(client, path):
+    # Warm the response cache so both pages see the same state
+    query_count(client, path, SMALL_PAGE)
+    small_queries, small_body = query_count(client, path, SMALL_PAGE)
+    large_queries, large_body = query_count(client, path, LARGE_PAGE)
+    assert large_body != small_body
+    assert small_queries == large_queries
@@ -0,0 +1,19 @@
+"""Search: the SQLite FTS5 index is built with the schema, and MySQL boolean queries are sanitized."""
+from app.utils.search_index import mysql_boolean_query
+from tests.conftest import API
+
+
+def test_fts5_index_finds_seeded_and_new_rows(client):
+    names = [repo["name"] for repo in client.get(f"{API}/search/repositories", params={"q": "rep"}).json()]
+    assert "repo0" in names
+
+    owner = client.post(f"{API}/users", json={"username": "searcher", "email": "searcher@example.com"}).json()["id"]
+    client.post(f"{API}/repositories", json={"name": "zebra_tools", "description": "stripes", "owner_id": owner})
+    found = client.get(f"{API}/search/repositories", params={"q": "zeb str"}).json()
+    assert [repo["name"] for repo in found] == ["zebra_tools"]
+
+
+def test_mysql_query_drops_operators_stopwords_and_short_words():
+    assert mysql_boolean_query('c++ "the parser" -legacy (fast)~ @2') == "+parser* +legacy* +fast*"
+    assert mysql_boolean_query("how to go") is None
+    assert mysql_boolean_query("snake_case") == "+snake_case*"
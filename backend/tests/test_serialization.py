@@ -0,0 +1,31 @@
+"""List responses rendered from projections match what response_model validation produced."""
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import joinedload
+
+from app.database import SessionLocal
+from app.models.commit import Commit
+from app.models.issue import Issue
+from app.schemas.commit_schema import CommitResponse
+from app.schemas.issue_schema import IssueResponse
+from tests.conftest import API
+
+
+def through_models(model, schema, relationship, repo_id):
+    db = SessionLocal()
+    try:
+        objects = db.query(model).options(joinedload(relationship)).filter(
+            model.repository_id == repo_id
+        ).order_by(model.created_at.desc(), model.id.desc()).limit(100).all()
+        return jsonable_encoder([schema.model_validate(obj) for obj in objects])
+    finally:
+        db.close()
+
+
+def test_commit_list_matches_models(client):
+    body = client.get(f"{API}/repositories/1/commits").json()
+    assert body == through_models(Commit, CommitResponse, Commit.author, 1)
+
+
+def test_issue_list_matches_models(client):
+    body = client.get(f"{API}/repositories/1/issues").json()
+    assert body == through_models(Issue, IssueResponse, Issue.creator, 1)
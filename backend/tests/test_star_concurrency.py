@@ -0,0 +1,91 @@
+"""Star counters stay exact when many threads star and unstar one repository at once."""
+import random
+import threading
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.controllers import star_controller
+from app.database import SessionLocal
+from app.models.repository import Repository
+from app.models.star import Star
+from tests.conftest import API
+
+THREADS = 8
+OPERATIONS = 40
+
+
+def create_users(client, prefix, count):
+    return [
+        client.post(f"{API}/users", json={"username": f"{prefix}{i}", "email": f"{prefix}{i}@example.com"}).json()["id"]
+        for i in range(count)
+    ]
+
+
+def run_threads(target, count):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            target(db, index)
+        except Exception as exc:  # surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def counts(repo_id):
+    db = SessionLocal()
+    try:
+        stored = db.query(Repository.stars_count).filter(Repository.id == repo_id).scalar()
+        actual = db.query(func.count(Star.id)).filter(Star.repository_id == repo_id).scalar()
+        return stored, actual
+    finally:
+        db.close()
+
+
+def test_concurrent_double_star_counts_once(client):
+    user_id, owner = create_users(client, "double-star", 2)
+    repo_id = client.post(f"{API}/repositories", json={"name": "double-star", "owner_id": owner}).json()["id"]
+    results = []
+
+    def star(db, index):
+        results.append(star_controller.star_repository(db, user_id, repo_id))
+
+    run_threads(star, THREADS)
+    assert sum(result.created for result in results) == 1
+    assert len({result.star_id for result in results}) == 1
+    assert counts(repo_id) == (1, 1)
+
+
+def test_concurrent_star_unstar_keeps_exact_count(client):
+    owner, *users = create_users(client, "hammer", 5)
+    repo_id = client.post(f"{API}/repositories", json={"name": "hammer", "owner_id": owner}).json()["id"]
+
+    def hammer(db, index):
+        rng = random.Random(index)
+        for _ in range(OPERATIONS):
+            user_id = rng.choice(users)
+            if rng.random() < 0.5:
+                try:
+                    star_controller.star_repository(db, user_id, repo_id)
+                except HTTPException as exc:
+                    # Only reachable where the database does not lock on conflict
+                    assert exc.status_code == 409
+            else:
+                star_controller.unstar_repository(db, user_id, repo_id)
+
+    run_threads(hammer, THREADS)
+    stored, actual = counts(repo_id)
+    assert stored == actual
+    assert client.get(f"{API}/repositories/{repo_id}").json()["stars_count"] == actual
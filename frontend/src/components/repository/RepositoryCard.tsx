@@ -2,12 +2,15 @@ import { Link } from 'react-router-dom';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Repository } from '@/services/repositoryService';
+import StarButton from './StarButton';
 
 interface RepositoryCardProps {
   repository: Repository;
+  // Star state from the list's checkMany call; the star button shows once it is known
+  starred?: boolean;
 }
 
-export default function RepositoryCard({ repository }: RepositoryCardProps) {
+export default function RepositoryCard({ repository, starred }: RepositoryCardProps) {
   return (
     <Link to={`/repositories/${repository.id}`}>
       <Card className="hover:shadow-lg transition-shadow">
@@ -25,6 +28,12 @@ export default function RepositoryCard({ repository }: RepositoryCardProps) {
               by {repository.owner.username}
             </CardDescription>
           )}
+          {starred !== undefined && (
+            // The card is a link; starring should not open the repository
+            <div onClick={(e) => e.preventDefault()}>
+              <StarButton userId={repository.owner_id} repositoryId={repository.id} initialStarred={starred} />
+            </div>
+          )}
         </CardHeader>
         {repository.description && (
           <CardContent>
@@ -6,13 +6,20 @@ import { starService } from '@/services/starService';
 interface StarButtonProps {
   userId: number;
   repositoryId: number;
+  // Star state already fetched for a whole list; skips the per-button check
+  initialStarred?: boolean;
 }
 
-export default function StarButton({ userId, repositoryId }: StarButtonProps) {
-  const [isStarred, setIsStarred] = useState(false);
-  const [loading, setLoading] = useState(true);
+export default function StarButton({ userId, repositoryId, initialStarred }: StarButtonProps) {
+  const [isStarred, setIsStarred] = useState(initialStarred ?? false);
+  const [loading, setLoading] = useState(initialStarred === undefined);
 
   useEffect(() => {
+    if (initialStarred !== undefined) {
+      setIsStarred(initialStarred);
+      setLoading(false);
+      return;
+    }
     const checkStarred = async () => {
       try {
         const starred = await starService.isStarred(userId, repositoryId);
@@ -24,7 +31,7 @@ export default function StarButton({ userId, repositoryId }: StarButtonProps) {
       }
     };
     checkStarred();
-  }, [userId, repositoryId]);
+  }, [userId, repositoryId, initialStarred]);
 
   const handleToggle = async () => {
     try {
@@ -0,0 +1,46 @@
+import { useState, useEffect } from 'react';
+import { starService } from '@/services/starService';
+import type { Repository } from '@/services/repositoryService';
+
+/**
+ * Star state of every repository in a list, keyed by repository id.
+ *
+ * Stars are checked as each repository's owner, like the repository page
+ * does, with one checkMany request per distinct owner instead of one
+ * isStarred request per card. Returns null until the states are loaded.
+ */
+export function useStarred(repositories: Repository[]): Record<number, boolean> | null {
+  const [starred, setStarred] = useState<Record<number, boolean> | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const byOwner = new Map<number, number[]>();
+    for (const repo of repositories) {
+      byOwner.set(repo.owner_id, [...(byOwner.get(repo.owner_id) ?? []), repo.id]);
+    }
+
+    const load = async () => {
+      try {
+        const results = await Promise.all(
+          [...byOwner].map(([ownerId, ids]) => starService.checkMany(ownerId, ids))
+        );
+        const states: Record<number, boolean> = {};
+        for (const result of results) {
+          for (const [id, isStarred] of Object.entries(result)) {
+            states[Number(id)] = isStarred;
+          }
+        }
+        if (!cancelled) setStarred(states);
+      } catch (error) {
+        console.error('Error checking star status:', error);
+      }
+    };
+    setStarred(null);
+    if (repositories.length > 0) load();
+    return () => {
+      cancelled = true;
+    };
+  }, [repositories]);
+
+  return starred;
+}
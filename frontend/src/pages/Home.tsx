@@ -1,12 +1,14 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import RepositoryCard from '@/components/repository/RepositoryCard';
+import { useStarred } from '@/hooks/useStarred';
 import RepositoryForm from '@/components/repository/RepositoryForm';
 import { Button } from '@/components/ui/button';
 import { repositoryService, Repository, RepositoryCreate } from '@/services/repositoryService';
 
 export default function Home() {
   const [repositories, setRepositories] = useState<Repository[]>([]);
+  const starred = useStarred(repositories);
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
 
@@ -56,7 +58,7 @@ export default function Home() {
 
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
         {repositories.map((repo) => (
-          <RepositoryCard key={repo.id} repository={repo} />
+          <RepositoryCard key={repo.id} repository={repo} starred={starred?.[repo.id]} />
         ))}
       </div>
 
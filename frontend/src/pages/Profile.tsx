@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import ProfileHeader from '@/components/profile/ProfileHeader';
 import RepositoryCard from '@/components/repository/RepositoryCard';
+import { useStarred } from '@/hooks/useStarred';
 import { userService, User } from '@/services/userService';
 import { repositoryService, Repository } from '@/services/repositoryService';
 
@@ -9,6 +10,7 @@ export default function Profile() {
   const { username } = useParams<{ username: string }>();
   const [user, setUser] = useState<User | null>(null);
   const [repositories, setRepositories] = useState<Repository[]>([]);
+  const starred = useStarred(repositories);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -61,7 +63,7 @@ export default function Profile() {
         <h2 className="text-2xl font-bold mb-4">Repositories</h2>
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
           {repositories.map((repo) => (
-            <RepositoryCard key={repo.id} repository={repo} />
+            <RepositoryCard key={repo.id} repository={repo} starred={starred?.[repo.id]} />
           ))}
         </div>
         {repositories.length === 0 && (
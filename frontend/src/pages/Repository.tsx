@@ -8,7 +8,7 @@ import IssueCard from '@/components/issue/IssueCard';
 import IssueForm from '@/components/issue/IssueForm';
 import StarButton from '@/components/repository/StarButton';
 import { repositoryService, Repository, RepositoryUpdate, RepositoryCreate } from '@/services/repositoryService';
-import { commitService, Commit } from '@/services/commitService';
+import { Commit } from '@/services/commitService';
 import { issueService, Issue } from '@/services/issueService';
 
 export default function Repository() {
@@ -23,19 +23,19 @@ export default function Repository() {
 
   useEffect(() => {
     if (id) {
-      loadRepository();
-      loadCommits();
-      loadIssues();
+      loadOverview();
     }
   }, [id]);
 
-  const loadRepository = async () => {
+  const loadOverview = async () => {
     if (!id) return;
     try {
-      const data = await repositoryService.getById(parseInt(id));
-      setRepository(data);
-      if (data.owner_id) {
-        setSelectedUserId(data.owner_id);
+      const data = await repositoryService.getOverview(parseInt(id));
+      setRepository(data.repository);
+      setCommits(data.commits);
+      setIssues(data.issues);
+      if (data.repository.owner_id) {
+        setSelectedUserId(data.repository.owner_id);
       }
     } catch (error) {
       console.error('Error loading repository:', error);
@@ -44,13 +44,18 @@ export default function Repository() {
     }
   };
 
-  const loadCommits = async () => {
+  const loadRepository = async () => {
     if (!id) return;
     try {
-      const data = await commitService.getByRepository(parseInt(id));
-      setCommits(data);
+      const data = await repositoryService.getById(parseInt(id));
+      setRepository(data);
+      if (data.owner_id) {
+        setSelectedUserId(data.owner_id);
+      }
     } catch (error) {
-      console.error('Error loading commits:', error);
+      console.error('Error loading repository:', error);
+    } finally {
+      setLoading(false);
     }
   };
 
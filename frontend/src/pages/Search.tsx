@@ -2,6 +2,7 @@ import { useState } from 'react';
 import { Link } from 'react-router-dom';
 import SearchBar from '@/components/search/SearchBar';
 import RepositoryCard from '@/components/repository/RepositoryCard';
+import { useStarred } from '@/hooks/useStarred';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { searchService } from '@/services/searchService';
 import { Repository } from '@/services/repositoryService';
@@ -9,6 +10,7 @@ import { User } from '@/services/userService';
 
 export default function Search() {
   const [repositories, setRepositories] = useState<Repository[]>([]);
+  const starred = useStarred(repositories);
   const [users, setUsers] = useState<User[]>([]);
   const [loading, setLoading] = useState(false);
   const [query, setQuery] = useState('');
@@ -44,7 +46,7 @@ export default function Search() {
             {repositories.length > 0 ? (
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
                 {repositories.map((repo) => (
-                  <RepositoryCard key={repo.id} repository={repo} />
+                  <RepositoryCard key={repo.id} repository={repo} starred={starred?.[repo.id]} />
                 ))}
               </div>
             ) : (
@@ -1,5 +1,7 @@
 import api from './api';
 import { User } from './userService';
+import { Commit } from './commitService';
+import { Issue } from './issueService';
 
 export interface Repository {
   id: number;
@@ -7,11 +9,23 @@ export interface Repository {
   description?: string;
   owner_id: number;
   is_public: boolean;
+  stars_count: number;
+  open_issues_count: number;
+  closed_issues_count: number;
   created_at: string;
   updated_at: string;
   owner?: User;
 }
 
+export interface RepositoryOverview {
+  repository: Repository;
+  commits: Commit[];
+  commits_next_cursor?: string;
+  issues: Issue[];
+  issues_next_cursor?: string;
+  is_starred?: boolean;
+}
+
 export interface RepositoryCreate {
   name: string;
   description?: string;
@@ -38,6 +52,13 @@ export const repositoryService = {
     return response.data;
   },
 
+  getOverview: async (id: number, userId?: number): Promise<RepositoryOverview> => {
+    const params: any = {};
+    if (userId) params.user_id = userId;
+    const response = await api.get(`/repositories/${id}/overview`, { params });
+    return response.data;
+  },
+
   create: async (repo: RepositoryCreate): Promise<Repository> => {
     const response = await api.post('/repositories', repo);
     return response.data;
@@ -26,4 +26,11 @@ export const starService = {
     const response = await api.get(`/users/${userId}/stars/${repositoryId}/check`);
     return response.data.is_starred;
   },
+
+  checkMany: async (userId: number, repositoryIds: number[]): Promise<Record<string, boolean>> => {
+    const response = await api.get(`/users/${userId}/stars/check`, {
+      params: { ids: repositoryIds.join(',') },
+    });
+    return response.data.is_starred;
+  },
 };